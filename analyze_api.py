@@ -1,6 +1,5 @@
 import asyncio
 import json
-from playwright.async_api import async_playwright
 
 
 async def run(playwright):
@@ -58,6 +57,9 @@ async def run(playwright):
 
 
 async def main():
+    # Playwright는 이 분석 도구에서만 사용 (봇 의존성에서 제외)
+    from playwright.async_api import async_playwright
+
     async with async_playwright() as playwright:
         await run(playwright)
 
@@ -0,0 +1,63 @@
+"""
+JSON 백엔드 벤치마크 — 기록된 기획전 응답으로 core.jsoncodec 백엔드별 속도 비교
+
+사용법:
+    python bench/bench_json.py                 # bench/payloads/*.json 사용
+    python bench/bench_json.py a.json b.json   # 직접 기록한 응답 파일 사용
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import jsoncodec  # noqa: E402
+
+PAYLOAD_DIR = Path(__file__).parent / "payloads"
+NUMBER = 2000
+
+
+def bench(label, func, number=NUMBER):
+    sec = timeit.timeit(func, number=number)
+    return label, sec / number * 1e6
+
+
+def main():
+    paths = [Path(p) for p in sys.argv[1:]] or sorted(PAYLOAD_DIR.glob("*.json"))
+    payloads = [(p.name, p.read_bytes()) for p in paths]
+
+    # 상태 저장(known_vehicles 스냅샷) 크기 예시: 기획전 3개 × 200대
+    snapshot = {
+        exhb: [f"{exhb}-{i:08d}-VEHICLE-ID" for i in range(200)]
+        for exhb in ("E20260277", "D0003", "R0003")
+    }
+
+    print(f"백엔드: {', '.join(jsoncodec.BACKENDS)} (기본: {jsoncodec.BACKEND})")
+    print(f"{'backend':<8} {'payload':<28} {'op':<14} {'us/op':>10}")
+    default = jsoncodec.BACKEND
+    for backend in jsoncodec.BACKENDS:
+        jsoncodec.set_backend(backend)
+        for name, body in payloads:
+            obj = jsoncodec.loads(body)
+            results = [
+                bench("decode", lambda: jsoncodec.loads(body)),
+                bench("encode", lambda: jsoncodec.dumps(obj)),
+                bench("encode-pretty", lambda: jsoncodec.dumps(obj, indent=2)),
+            ]
+            for op, us in results:
+                print(f"{backend:<8} {name:<28} {op:<14} {us:>10.1f}")
+        for op, us in (
+            bench("snap-encode", lambda: jsoncodec.dumps(snapshot), number=200),
+            bench(
+                "snap-decode",
+                lambda: jsoncodec.loads(jsoncodec.dumps(snapshot)),
+                number=200,
+            ),
+        ):
+            print(f"{backend:<8} {'known_vehicles(600)':<28} {op:<14} {us:>10.1f}")
+    jsoncodec.set_backend(default)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+알림 전송 처리량 벤치마크 — 로컬 Discord REST 모의 서버(bench/fake_discord.py) 대상
+
+신규 차량 버스트(기본 1/10/100대, 전체 기획전에 분산)를 main.py의 알림 경로
+(build_embed → _notify_new → 디스패처 → discord.py HTTP)로 전송하고,
+마지막 메시지 도착까지의 시간과 사용한 요청 수(429 포함)를 측정합니다.
+비교용으로 차량 1대·채널 1곳당 메시지 1건을 순차 전송하는 방식도 함께 측정합니다.
+
+사용법:
+    python bench/bench_notify.py
+    python bench/bench_notify.py --bursts 1,10,100,300 --targets 3 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "bench"))
+
+import discord  # noqa: E402
+
+from core.vehicle import from_raw  # noqa: E402
+from fake_casper import FakeCasper  # noqa: E402
+from fake_discord import FakeDiscord  # noqa: E402
+
+INTEGRATED_CHANNEL_ID = 900
+TARGET_LABELS = ("특별기획전", "전시차", "리퍼브")
+
+
+def _write_config(tmp, n_targets):
+    targets = [
+        {
+            "exhbNo": f"E{i:04d}",
+            "label": TARGET_LABELS[i % len(TARGET_LABELS)] + (f"{i}" if i >= 3 else ""),
+            "channelId": str(1000 + i),
+        }
+        for i in range(n_targets)
+    ]
+    config = {
+        "discord": {
+            "token": "bench",
+            "integratedChannelId": str(INTEGRATED_CHANNEL_ID),
+        },
+        "targets": targets,
+        "api": {"baseUrl": "http://127.0.0.1:9", "headers": {}, "defaultPayload": {}},
+    }
+    path = Path(tmp) / "config.json"
+    path.write_text(json.dumps(config, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def _burst(main, n_cars):
+    """n_cars대를 기획전에 고르게 나눈 [(target, [Vehicle, ...]), ...]."""
+    factory = FakeCasper(seed=n_cars)
+    targets = main.config["targets"]
+    groups = {t["exhbNo"]: [] for t in targets}
+    for i in range(n_cars):
+        target = targets[i % len(targets)]
+        raw = factory._vehicle("AX05")
+        groups[target["exhbNo"]].append(from_raw(raw))
+    return [(t, groups[t["exhbNo"]]) for t in targets if groups[t["exhbNo"]]]
+
+
+async def _run_dispatcher(main, client, burst):
+    from core.dispatcher import NotificationDispatcher
+
+    main.dispatcher = NotificationDispatcher()
+    main.dispatcher.start(client.get_partial_messageable)
+    for target, vehicles in burst:
+        main._notify_new(target, vehicles)
+    await main.dispatcher.drain(timeout=300)
+
+
+async def _run_sequential(main, client, burst):
+    """배치 없이 차량 1대·채널 1곳당 메시지 1건 순차 전송 (비교 기준)."""
+    for target, vehicles in burst:
+        color = target.get("color", "0x3B82F6")
+        for vehicle in vehicles:
+            embed = main.build_embed(vehicle, target["label"], color)
+            for cid in (INTEGRATED_CHANNEL_ID, int(target["channelId"])):
+                channel = client.get_partial_messageable(cid)
+                await channel.send(content="@everyone", embed=embed)
+
+
+async def measure(main, server, mode, n_cars):
+    server.reset()
+    client = discord.Client(intents=discord.Intents.none())
+    await client.login("bench-token")
+    burst = _burst(main, n_cars)
+    started = time.monotonic()
+    try:
+        if mode == "dispatcher":
+            await _run_dispatcher(main, client, burst)
+        else:
+            await _run_sequential(main, client, burst)
+    finally:
+        await client.close()
+    last = server.last_message_at or started
+    return {
+        "mode": mode,
+        "cars": n_cars,
+        "seconds": last - started,
+        **server.stats,
+    }
+
+
+async def bench(args):
+    server = FakeDiscord(
+        route_limit=args.route_limit,
+        route_per=args.route_per,
+        latency=args.latency,
+    )
+    await server.start()
+    discord.http.Route.BASE = server.api_base
+
+    tmp = tempfile.mkdtemp(prefix="casperfinder-bench-")
+    os.environ["CASPERFINDER_CONFIG"] = str(_write_config(tmp, args.targets))
+    os.environ["CASPERFINDER_DATA_DIR"] = str(Path(tmp) / "data")
+
+    import main  # noqa: E402  (환경 변수 설정 후 import)
+
+    level = logging.INFO if args.verbose else logging.ERROR
+    logging.getLogger("CasperFinder").setLevel(level)
+    logging.getLogger("discord").setLevel(level)
+
+    print(
+        f"기획전 {args.targets}개, 채널 버킷 {args.route_limit}건/{args.route_per}s, "
+        f"응답 지연 {args.latency * 1000:.0f}ms"
+    )
+    print(
+        f"{'mode':<11} {'cars':>5} {'last msg(s)':>11} {'requests':>9} "
+        f"{'429':>5} {'messages':>9} {'embeds':>7}"
+    )
+    try:
+        for n_cars in args.bursts:
+            modes = ["dispatcher"] + (
+                ["sequential"] if not args.skip_sequential else []
+            )
+            for mode in modes:
+                r = await measure(main, server, mode, n_cars)
+                print(
+                    f"{r['mode']:<11} {r['cars']:>5} {r['seconds']:>11.2f} "
+                    f"{r['requests']:>9} {r['ratelimited']:>5} {r['messages']:>9} "
+                    f"{r['embeds']:>7}"
+                )
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="알림 전송 처리량 벤치마크")
+    parser.add_argument(
+        "--bursts",
+        default="1,10,100",
+        type=lambda s: [int(x) for x in s.split(",")],
+        help="버스트당 신규 차량 수 목록",
+    )
+    parser.add_argument("--targets", type=int, default=3, help="기획전(채널) 수")
+    parser.add_argument("--route-limit", type=int, default=5)
+    parser.add_argument("--route-per", type=float, default=5.0)
+    parser.add_argument("--latency", type=float, default=0.03, help="응답 지연 (초)")
+    parser.add_argument(
+        "--skip-sequential", action="store_true", help="순차 전송 비교 생략"
+    )
+    parser.add_argument("--verbose", action="store_true")
+    asyncio.run(bench(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
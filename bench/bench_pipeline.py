@@ -0,0 +1,245 @@
+"""
+조회 파이프라인 종단간 벤치마크 — 로컬 모의 서버(bench/fake_casper.py) 대상
+
+main.py의 poll() 파이프라인(스케줄러 → 조회/페이지네이션 → 지문/파싱 → 필터/Diff → 디스패처)을
+실제 코드 그대로 구동하고, Discord 전송만 기록용 가짜 채널로 대체합니다.
+
+측정 항목 (기획전 수별):
+    - 감지 지연: 모의 서버에 매물 추가 → 디스패처가 전송한 시각
+    - 처리량: 초당 완료된 기획전 조회 수 / 초당 API 요청 수
+
+사용법:
+    python bench/bench_pipeline.py
+    python bench/bench_pipeline.py --targets 1,5,20 --duration 30 --latency 0.08 --rpm 600
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "bench"))
+
+from fake_casper import FakeCasper  # noqa: E402
+
+PROD_NO_RE = re.compile(r"carProductionNumber=(\d+)")
+README_PAYLOAD = {
+    "subsidyRegion": "1100",
+    "choiceOptYn": "Y",
+    "carCode": "",
+    "sortCode": "50",
+    "deliveryAreaCode": "T",
+    "deliveryLocalAreaCode": "T1",
+    "carBodyCode": "",
+    "carEngineCode": "",
+    "carTrimCode": "",
+    "exteriorColorCode": "",
+    "interiorColorCode": [],
+    "deliveryCenterCode": "",
+    "wpaScnCd": "",
+    "optionFilter": "",
+    "pageNo": 1,
+    "pageSize": 18,
+}
+
+
+class RecordingChannel:
+    """channel.send 호출 시각과 Embed를 기록하는 가짜 채널."""
+
+    def __init__(self, channel_id, sink):
+        self.id = channel_id
+        self.sink = sink
+
+    async def send(self, content=None, embeds=()):
+        now = time.monotonic()
+        for embed in embeds:
+            match = PROD_NO_RE.search(embed.description or "")
+            if match:
+                self.sink.setdefault(match.group(1), now)
+
+
+def _write_config(tmp, server):
+    config = {
+        "discord": {"token": "bench", "integratedChannelId": "1"},
+        "targets": [],
+        "api": {
+            **server.api_urls(),
+            "poolSize": 10,
+            "headers": {
+                "Content-Type": "application/json;charset=utf-8",
+                "Accept": "application/json, text/plain, */*",
+            },
+            "defaultPayload": README_PAYLOAD,
+        },
+    }
+    path = Path(tmp) / "config.json"
+    path.write_text(json.dumps(config, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def _pct(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def _drive(main, stop):
+    """poll() 루프를 SCHEDULER_TICK 간격으로 직접 구동."""
+    while not stop.is_set():
+        await main.poll.coro()
+        await asyncio.sleep(main.SCHEDULER_TICK)
+
+
+async def run_case(main, server, run_no, n_targets, args, detected):
+    targets = [
+        {
+            "exhbNo": f"E{run_no:02d}{i:04d}",
+            "label": f"T{run_no}-{i}",
+            "channelId": str(1000 + i),
+        }
+        for i in range(n_targets)
+    ]
+    for target in targets:
+        server.seed(target["exhbNo"], args.seed_count)
+    main.config["targets"] = targets
+
+    stop = asyncio.Event()
+    driver = asyncio.create_task(_drive(main, stop))
+
+    # 초기 등록(알림 없음) 완료 대기
+    while any(t["exhbNo"] not in main.known_store for t in targets):
+        await asyncio.sleep(0.05)
+
+    stats_before = dict(server.stats)
+    polls_before = main.poll_count
+    inserted = []
+    started = time.monotonic()
+    interval = 1.0 / args.inserts_per_sec
+    while time.monotonic() - started < args.duration:
+        target = server.rng.choice(targets)
+        inserted.append(server.insert(target["exhbNo"]))
+        await asyncio.sleep(interval)
+    elapsed = time.monotonic() - started
+
+    # 남은 매물 감지 대기
+    deadline = time.monotonic() + args.grace
+    while time.monotonic() < deadline and any(p not in detected for p in inserted):
+        await asyncio.sleep(0.1)
+
+    stop.set()
+    await driver
+    await asyncio.gather(*main._inflight, return_exceptions=True)
+
+    latencies = [detected[p] - server.inserted_at[p] for p in inserted if p in detected]
+    requests = server.stats["cars"] - stats_before["cars"]
+    polls = main.poll_count - polls_before
+    return {
+        "targets": n_targets,
+        "inserted": len(inserted),
+        "detected": len(latencies),
+        "p50": _pct(latencies, 0.5),
+        "p95": _pct(latencies, 0.95),
+        "max": max(latencies) if latencies else float("nan"),
+        "mean": statistics.fmean(latencies) if latencies else float("nan"),
+        "polls_per_sec": polls / elapsed,
+        "requests_per_sec": requests / elapsed,
+        "waf": server.stats["waf"] - stats_before["waf"],
+    }
+
+
+async def bench(args):
+    server = FakeCasper(
+        latency=args.latency,
+        jitter=args.latency / 4,
+        token_ttl=args.token_ttl,
+        waf_rate=args.waf_rate,
+    )
+    await server.start()
+
+    tmp = tempfile.mkdtemp(prefix="casperfinder-bench-")
+    os.environ["CASPERFINDER_CONFIG"] = str(_write_config(tmp, server))
+    os.environ["CASPERFINDER_DATA_DIR"] = str(Path(tmp) / "data")
+
+    import main  # noqa: E402  (환경 변수 설정 후 import)
+
+    logging.getLogger("CasperFinder").setLevel(
+        logging.INFO if args.verbose else logging.WARNING
+    )
+    poll_config = {"baseInterval": args.base_interval}
+    if args.rpm:
+        poll_config["requestsPerMinute"] = args.rpm
+    main.scheduler.configure(poll_config)
+
+    detected = {}
+    channels = {}
+    main.dispatcher.start(
+        lambda cid: channels.setdefault(cid, RecordingChannel(cid, detected))
+    )
+    main.load_known_vehicles()
+    if not await main.refresher.refresh_tokens(force=True):
+        print("토큰 발급 실패 — 모의 서버 설정 확인")
+        return
+
+    print(
+        f"모의 서버 지연 {args.latency * 1000:.0f}ms, 기본 주기 {args.base_interval}s, "
+        f"분당 예산 {main.scheduler.requests_per_minute}, 매물 추가 {args.inserts_per_sec}/s, "
+        f"측정 {args.duration}s"
+    )
+    print(
+        f"{'targets':>7} {'detected':>9} {'p50(s)':>7} {'p95(s)':>7} {'max(s)':>7} "
+        f"{'polls/s':>8} {'req/s':>7} {'waf':>4}"
+    )
+    try:
+        for run_no, n in enumerate(args.targets, 1):
+            r = await run_case(main, server, run_no, n, args, detected)
+            print(
+                f"{r['targets']:>7} {r['detected']:>4}/{r['inserted']:<4} "
+                f"{r['p50']:>7.2f} {r['p95']:>7.2f} {r['max']:>7.2f} "
+                f"{r['polls_per_sec']:>8.2f} {r['requests_per_sec']:>7.2f} {r['waf']:>4}"
+            )
+    finally:
+        await main.dispatcher.drain(timeout=2)
+        await main.session_pool.close()
+        main.known_store.close()
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="조회 파이프라인 종단간 벤치마크")
+    parser.add_argument(
+        "--targets",
+        default="1,3,10",
+        type=lambda s: [int(x) for x in s.split(",")],
+        help="기획전 수 목록 (예: 1,3,10)",
+    )
+    parser.add_argument("--duration", type=float, default=15, help="측정 시간 (초)")
+    parser.add_argument(
+        "--grace", type=float, default=10, help="측정 후 감지 대기 (초)"
+    )
+    parser.add_argument("--inserts-per-sec", type=float, default=1.0)
+    parser.add_argument(
+        "--seed-count", type=int, default=30, help="기획전당 초기 매물 수"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="모의 서버 응답 지연 (초)"
+    )
+    parser.add_argument("--base-interval", type=float, default=3)
+    parser.add_argument("--rpm", type=int, default=0, help="분당 요청 예산 (0=기본값)")
+    parser.add_argument("--token-ttl", type=float, default=1200)
+    parser.add_argument("--waf-rate", type=float, default=0.0)
+    parser.add_argument("--verbose", action="store_true")
+    asyncio.run(bench(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+로컬 캐스퍼 API 모의 서버 — 실서버 없이 조회 파이프라인을 재현/측정하기 위한 대역
+
+제공 경로:
+    GET  /                                                     메인 페이지 (보안 쿠키 발급)
+    GET  /gw/wp/common/v2/common/ui/layout-sync                State-Key(layoutHash) 발급
+    POST /gw/wp/product/v2/product/exhibition/cars/{exhbNo}    기획전 차량 목록 (페이지네이션)
+
+- 응답 지연(latency ± jitter), 페이지 크기, 토큰 수명(token_ttl) 설정
+- 토큰 만료/미발급 또는 waf_rate 확률로 "data 비어있는" 가짜 성공 응답(WAF) 반환
+- insert()로 매물을 추가하면 추가 시각을 기록 (감지 지연 측정용)
+
+단독 실행:
+    python bench/fake_casper.py --port 8800 --targets E20260277,D0003,R0003
+    → config.json 의 api.baseUrl / api.mainUrl / api.layoutSyncUrl 을 출력된 주소로 변경
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+from aiohttp import web
+
+LAYOUT_SYNC_PATH = "/gw/wp/common/v2/common/ui/layout-sync"
+CARS_PATH = "/gw/wp/product/v2/product/exhibition/cars"
+COOKIE_NAME = "TS01fake"
+
+TRIMS = ("인스퍼레이션", "크로스", "프리미엄")
+EXT_COLORS = (
+    "아틀라스 화이트",
+    "버터크림 옐로우 펄",
+    "톰보이 카키",
+    "언블리치드 아이보리",
+)
+CENTERS = ("칠곡출고센터", "인천출고센터", "울산출고센터")
+OPTIONS = ("선루프", "컴포트", "파킹 어시스트", "현대 스마트센스 I")
+
+
+class FakeCasper:
+    def __init__(
+        self,
+        latency=0.02,
+        jitter=0.0,
+        page_size=18,
+        token_ttl=600.0,
+        waf_rate=0.0,
+        seed=0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.page_size = page_size
+        self.token_ttl = token_ttl
+        self.waf_rate = waf_rate
+        self.rng = random.Random(seed)
+        self.inventory = {}
+        self.inserted_at = {}  # carProductionNumber → 추가 시각 (monotonic)
+        self.tokens = {}  # layoutHash → 발급 시각
+        self.cookies = set()
+        self.stats = {"main": 0, "layout_sync": 0, "cars": 0, "first_page": 0, "waf": 0}
+        self._runner = None
+        self.base_url = None
+
+    # ── 매물 ──
+    def _vehicle(self, car_code):
+        rng = self.rng
+        prod_no = str(rng.randrange(10**9, 10**10))
+        return {
+            "vehicleId": str(uuid.UUID(int=rng.getrandbits(128))).upper(),
+            "carCode": car_code,
+            "carNm": "캐스퍼 일렉트릭",
+            "modelNm": "캐스퍼 일렉트릭",
+            "trimNm": rng.choice(TRIMS),
+            "extCrNm": rng.choice(EXT_COLORS),
+            "intCrNm": "블랙 인조가죽",
+            "poName": rng.choice(CENTERS),
+            "carProductionDate": f"2024{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}",
+            "criterionYearMonth": "202602",
+            "carProductionNumber": prod_no,
+            "carPrice": rng.randrange(27_000_000, 36_000_000, 10_000),
+            "discountAmt": rng.choice((0, 300_000, 500_000)),
+            "options": [{"optionName": o} for o in rng.sample(OPTIONS, 2)],
+        }
+
+    def seed(self, exhb_no, count, car_code="AX05"):
+        """초기 매물 채우기 (추가 시각 기록 없음)."""
+        cars = self.inventory.setdefault(exhb_no, [])
+        cars.extend(self._vehicle(car_code) for _ in range(count))
+
+    def insert(self, exhb_no, car_code="AX05"):
+        """신규 매물 추가 (목록 맨 앞 = 최신순). carProductionNumber 반환."""
+        vehicle = self._vehicle(car_code)
+        self.inventory.setdefault(exhb_no, []).insert(0, vehicle)
+        prod_no = vehicle["carProductionNumber"]
+        self.inserted_at[prod_no] = time.monotonic()
+        return prod_no
+
+    def expire_tokens(self):
+        """발급된 토큰/쿠키를 모두 무효화 (토큰 만료 상황 재현)."""
+        self.tokens.clear()
+        self.cookies.clear()
+
+    # ── 핸들러 ──
+    async def _delay(self):
+        delay = self.latency + self.rng.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _main(self, request):
+        self.stats["main"] += 1
+        await self._delay()
+        resp = web.Response(
+            text="<html><body>casper</body></html>", content_type="text/html"
+        )
+        cookie = uuid.uuid4().hex
+        self.cookies.add(cookie)
+        resp.set_cookie(COOKIE_NAME, cookie)
+        return resp
+
+    async def _layout_sync(self, request):
+        self.stats["layout_sync"] += 1
+        await self._delay()
+        if request.cookies.get(COOKIE_NAME) not in self.cookies:
+            return web.json_response({"rspStatus": {"rspCode": "9999"}, "data": {}})
+        token = str(uuid.uuid4())
+        self.tokens[token] = time.monotonic()
+        return web.json_response(
+            {
+                "rspStatus": {"rspCode": "0000"},
+                "data": {"layoutHash": token, "valid": True},
+            }
+        )
+
+    def _authorized(self, request):
+        issued = self.tokens.get(request.headers.get("X-UX-State-Key", ""))
+        if issued is None or time.monotonic() - issued > self.token_ttl:
+            return False
+        if request.cookies.get(COOKIE_NAME) not in self.cookies:
+            return False
+        return self.rng.random() >= self.waf_rate
+
+    async def _cars(self, request):
+        self.stats["cars"] += 1
+        await self._delay()
+        payload = json.loads(await request.read() or b"{}")
+        page_no = int(payload.get("pageNo") or 1)
+        if page_no == 1:
+            self.stats["first_page"] += 1
+
+        if not self._authorized(request):
+            self.stats["waf"] += 1
+            return web.json_response({"rspStatus": {"rspCode": "0000"}, "data": {}})
+
+        cars = self.inventory.get(request.match_info["exhb_no"], [])
+        size = int(payload.get("pageSize") or self.page_size)
+        start = (page_no - 1) * size
+        return web.json_response(
+            {
+                "rspStatus": {"rspCode": "0000", "rspMessage": "성공"},
+                "data": {
+                    "totalCount": len(cars),
+                    "discountsearchcars": cars[start : start + size],
+                },
+            }
+        )
+
+    # ── 서버 ──
+    async def start(self, host="127.0.0.1", port=0):
+        app = web.Application()
+        app.router.add_get("/", self._main)
+        app.router.add_get(LAYOUT_SYNC_PATH, self._layout_sync)
+        app.router.add_post(CARS_PATH + "/{exhb_no}", self._cars)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        self.base_url = f"http://{host}:{bound_port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def api_urls(self):
+        """config.json api 섹션에 넣을 URL 세트."""
+        return {
+            "baseUrl": self.base_url + CARS_PATH,
+            "mainUrl": self.base_url + "/",
+            "layoutSyncUrl": self.base_url + LAYOUT_SYNC_PATH,
+        }
+
+
+async def _serve(args):
+    server = FakeCasper(
+        latency=args.latency,
+        jitter=args.jitter,
+        token_ttl=args.token_ttl,
+        waf_rate=args.waf_rate,
+    )
+    targets = [t for t in args.targets.split(",") if t]
+    for exhb_no in targets:
+        server.seed(exhb_no, args.seed_count)
+    await server.start(args.host, args.port)
+    print(json.dumps(server.api_urls(), indent=2))
+    while True:
+        await asyncio.sleep(args.insert_every or 3600)
+        if args.insert_every and targets:
+            exhb_no = server.rng.choice(targets)
+            print(f"insert {exhb_no} {server.insert(exhb_no)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--targets", default="E20260277,D0003,R0003")
+    parser.add_argument("--seed-count", type=int, default=30)
+    parser.add_argument(
+        "--insert-every", type=float, default=0, help="초 (0=추가 안 함)"
+    )
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--token-ttl", type=float, default=1200)
+    parser.add_argument("--waf-rate", type=float, default=0.0)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
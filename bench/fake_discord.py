@@ -0,0 +1,180 @@
+"""
+로컬 Discord REST 모의 서버 — 알림 전송 경로(디스패처 → discord.py HTTP)를 실서버 없이 측정하기 위한 대역
+
+제공 경로 (discord.http.Route.BASE 를 base_url + "/api/v10" 으로 바꿔 사용):
+    GET  /api/v10/users/@me                        로그인 (static_login)
+    GET  /api/v10/oauth2/applications/@me          애플리케이션 정보 (로그인 시 조회)
+    POST /api/v10/channels/{channel_id}/messages   메시지 전송
+
+- 채널(라우트)별 버킷: route_limit건 / route_per초, X-RateLimit-* 헤더 제공
+- 전역 한도(global_limit건/초) 초과 또는 버킷 소진 상태 요청은 429 + retry_after 응답
+- 요청/429/메시지/Embed 수와 마지막 메시지 수신 시각 기록
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+API_PREFIX = "/api/v10"
+BOT_USER = {
+    "id": "100000000000000001",
+    "username": "casperfinder-bench",
+    "discriminator": "0",
+    "global_name": None,
+    "avatar": None,
+    "bot": True,
+}
+
+APPLICATION = {
+    "id": "100000000000000002",
+    "name": "casperfinder-bench",
+    "icon": None,
+    "description": "",
+    "bot_public": False,
+    "bot_require_code_grant": False,
+    "verify_key": "",
+    "flags": 0,
+    "owner": BOT_USER,
+}
+
+
+def _json(data, status=200, headers=None):
+    # discord.py는 Content-Type이 정확히 application/json 일 때만 JSON으로 해석
+    return web.Response(
+        body=json.dumps(data).encode(),
+        status=status,
+        headers={**(headers or {}), "Content-Type": "application/json"},
+    )
+
+
+class _Bucket:
+    __slots__ = ("remaining", "reset_at")
+
+    def __init__(self):
+        self.remaining = 0
+        self.reset_at = 0.0
+
+
+class FakeDiscord:
+    def __init__(self, route_limit=5, route_per=5.0, global_limit=50, latency=0.03):
+        self.route_limit = route_limit
+        self.route_per = route_per
+        self.global_limit = global_limit
+        self.latency = latency
+        self._buckets = {}
+        self._global = []
+        self._next_id = 200000000000000000
+        self._runner = None
+        self.base_url = None
+        self.reset()
+
+    def reset(self):
+        """버킷/통계 초기화 (벤치마크 회차 사이)."""
+        self._buckets.clear()
+        self._global.clear()
+        self.stats = {"requests": 0, "ratelimited": 0, "messages": 0, "embeds": 0}
+        self.last_message_at = None
+
+    def _ratelimit_headers(self, channel_id, bucket, now):
+        return {
+            "X-RateLimit-Limit": str(self.route_limit),
+            "X-RateLimit-Remaining": str(bucket.remaining),
+            "X-RateLimit-Reset": f"{time.time() + bucket.reset_at - now:.3f}",
+            "X-RateLimit-Reset-After": f"{bucket.reset_at - now:.3f}",
+            "X-RateLimit-Bucket": f"messages:{channel_id}",
+        }
+
+    def _too_many(self, retry_after, headers, is_global=False):
+        self.stats["ratelimited"] += 1
+        headers = {**headers, "Retry-After": f"{retry_after:.3f}", "Via": "1.1 google"}
+        if is_global:
+            headers["X-RateLimit-Global"] = "true"
+        return _json(
+            {
+                "message": "You are being rate limited.",
+                "retry_after": round(retry_after, 3),
+                "global": is_global,
+            },
+            status=429,
+            headers=headers,
+        )
+
+    async def _me(self, request):
+        return _json(BOT_USER)
+
+    async def _application(self, request):
+        return _json(APPLICATION)
+
+    async def _create_message(self, request):
+        self.stats["requests"] += 1
+        channel_id = request.match_info["channel_id"]
+        now = time.monotonic()
+
+        # 전역 한도 (1초 이동 구간)
+        self._global = [t for t in self._global if now - t < 1.0]
+        if len(self._global) >= self.global_limit:
+            return self._too_many(1.0 - (now - self._global[0]), {}, is_global=True)
+        self._global.append(now)
+
+        bucket = self._buckets.setdefault(channel_id, _Bucket())
+        if now >= bucket.reset_at:
+            bucket.remaining = self.route_limit
+            bucket.reset_at = now + self.route_per
+        if bucket.remaining <= 0:
+            headers = self._ratelimit_headers(channel_id, bucket, now)
+            return self._too_many(bucket.reset_at - now, headers)
+        bucket.remaining -= 1
+        headers = self._ratelimit_headers(channel_id, bucket, now)
+
+        payload = await request.json()
+        await asyncio.sleep(self.latency)
+        embeds = payload.get("embeds") or []
+        self.stats["messages"] += 1
+        self.stats["embeds"] += len(embeds)
+        self.last_message_at = time.monotonic()
+        self._next_id += 1
+        return _json(
+            {
+                "id": str(self._next_id),
+                "channel_id": channel_id,
+                "type": 0,
+                "content": payload.get("content") or "",
+                "author": BOT_USER,
+                "embeds": embeds,
+                "attachments": [],
+                "mentions": [],
+                "mention_roles": [],
+                "mention_everyone": False,
+                "pinned": False,
+                "tts": False,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "edited_timestamp": None,
+            },
+            headers=headers,
+        )
+
+    async def start(self, host="127.0.0.1", port=0):
+        app = web.Application()
+        app.router.add_get(API_PREFIX + "/users/@me", self._me)
+        app.router.add_get(API_PREFIX + "/oauth2/applications/@me", self._application)
+        app.router.add_post(
+            API_PREFIX + "/channels/{channel_id}/messages", self._create_message
+        )
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        self.base_url = f"http://{host}:{self._runner.addresses[0][1]}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @property
+    def api_base(self):
+        """discord.http.Route.BASE 에 넣을 주소."""
+        return self.base_url + API_PREFIX
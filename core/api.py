@@ -4,15 +4,34 @@ API 클라이언트 모듈 (curl_cffi 기반 최적화)
 TLS Fingerprint 위장을 통해 WAF 우회를 보장합니다.
 """
 
-import json
+import asyncio
+import itertools
 import logging
+import math
 import time
-import asyncio
-from curl_cffi import requests
 
 log = logging.getLogger("CasperFinder")
 
+DEFAULT_PAGE_SIZE = 18
+DEFAULT_PAGE_CONCURRENCY = 3  # 2페이지 이후 동시 조회 상한
+DEFAULT_MAX_PAGES = 20  # 기획전당 최대 조회 페이지 수
+
+# 기획전 설정/질의 매트릭스에서 요청 body로 옮길 수 있는 키
+# (이 밖에 defaultPayload에 있는 키도 허용, 페이지/기획전 번호는 제외)
+OVERRIDE_KEYS = (
+    "carCode",
+    "deliveryAreaCode",
+    "deliveryLocalAreaCode",
+    "subsidyRegion",
+    "deliveryCenterCode",
+)
+RESERVED_KEYS = ("exhbNo", "pageNo", "pageSize")
+
+from core import jsoncodec, metrics
+from core.debug_capture import debug_capture
+from core.fingerprint import UNCHANGED, fingerprints
 from core.playwright_refresher import refresher
+from core.vehicle import Vehicle, normalize
 
 
 def build_url(api_config, exhb_no):
@@ -21,24 +40,53 @@ def build_url(api_config, exhb_no):
     return f"{api_config['baseUrl']}/{exhb_no}?t={ts}"
 
 
-def build_payload(api_config, exhb_no, target_overrides=None):
-    """API 요청 body 생성."""
+def build_payload(api_config, exhb_no, target_overrides=None, page_no=None):
+    """API 요청 body 생성. page_no 지정 시 해당 페이지 요청."""
     payload = {**api_config["defaultPayload"], "exhbNo": exhb_no}
+    if page_no is not None:
+        payload["pageNo"] = page_no
     if target_overrides:
-        for key in [
-            "carCode",
-            "deliveryAreaCode",
-            "deliveryLocalAreaCode",
-            "subsidyRegion",
-            "deliveryCenterCode",
-        ]:
-            if key in target_overrides:
+        for key in itertools.chain(OVERRIDE_KEYS, api_config["defaultPayload"]):
+            if key in target_overrides and key not in RESERVED_KEYS:
                 payload[key] = target_overrides[key]
     return payload
 
 
+def expand_queries(matrix):
+    """질의 매트릭스 → [(설명, overrides), ...] (축별 값의 모든 조합).
+
+    matrix 예: {"subsidyRegion": ["1100", "2600"],
+                "delivery": [{"deliveryAreaCode": "T", "deliveryLocalAreaCode": "T1"}, ...]}
+    값이 dict면 여러 키를 한 번에 지정하는 축(축 이름은 임의), 아니면 축 이름이 요청 키.
+    매트릭스가 비어 있으면 [(None, {})] (기존 단일 질의).
+    """
+    if not matrix:
+        return [(None, {})]
+    axes = []
+    for axis, values in matrix.items():
+        options = []
+        for value in values if isinstance(values, list) else [values]:
+            if isinstance(value, dict):
+                desc = "/".join(str(v) for v in value.values() if v != "")
+                options.append((desc or "-", value))
+            else:
+                options.append((str(value) if value != "" else "-", {axis: value}))
+        axes.append(options)
+
+    queries = []
+    for combo in itertools.product(*axes):
+        overrides = {}
+        for _, part in combo:
+            overrides.update(part)
+        queries.append((",".join(desc for desc, _ in combo), overrides))
+    return queries
+
+
 def parse_response(raw):
-    """API 응답 JSON 파싱. (success, vehicles, total, error) 반환."""
+    """API 응답 JSON 파싱. (success, vehicles, total, error) 반환.
+
+    vehicles는 core.vehicle.Vehicle 레코드 목록 (원본 dict는 보관하지 않음).
+    """
     data = raw.get("data", raw)
     rsp = raw.get("rspStatus", {})
 
@@ -47,26 +95,73 @@ def parse_response(raw):
 
     vehicles = data.get("list", data.get("discountsearchcars", []))
     total = data.get("totalCount", 0)
-    return True, vehicles, total, None
+    return True, normalize(vehicles), total, None
 
 
-def extract_vehicle_id(vehicle):
-    """차량 객체에서 고유 ID 추출."""
-    return vehicle.get("vehicleId", vehicle.get("vin", ""))
+def page_count(api_config, total):
+    """totalCount 기준 전체 페이지 수 (maxPages 상한 적용)."""
+    page_size = int(api_config["defaultPayload"].get("pageSize") or DEFAULT_PAGE_SIZE)
+    pages = math.ceil(total / page_size) if total > 0 else 1
+    return min(pages, int(api_config.get("maxPages", DEFAULT_MAX_PAGES)))
+
+
+def _outcome(success, vehicles, error):
+    if success:
+        return "unchanged" if vehicles is UNCHANGED else "ok"
+    if "가짜 응답" in str(error) or "HTTP 1000" in str(error):
+        return "blocked"
+    return "error"
 
 
 async def fetch_exhibition(
-    session, api_config, exhb_no, target_overrides=None, headers_override=None
+    session,
+    api_config,
+    exhb_no,
+    target_overrides=None,
+    headers_override=None,
+    page_no=None,
+    capture_key=None,
 ):
     """
-    단일 기획전 API 호출. (success, vehicles, total, error, raw_log) 반환.
-    curl_cffi를 사용하여 브라우저 통신을 완벽히 모방합니다.
+    단일 기획전 API 호출. (success, vehicles, total, error) 반환.
+    session은 core.session의 공유 curl_cffi AsyncSession (브라우저 지문 위장, keep-alive).
+    요청/응답 원본은 debug_capture 링 버퍼(capture_key, 기본 exhb_no)에 보관된다.
+
+    응답 바이트가 같은 페이지의 직전 확정 지문과 같으면 파싱 없이
+    (True, UNCHANGED, 직전 total, None)을 반환한다.
     """
+    capture_key = capture_key or exhb_no
+    result = await _request_exhibition(
+        session,
+        api_config,
+        exhb_no,
+        target_overrides,
+        headers_override,
+        page_no,
+        capture_key,
+    )
+    success, vehicles, _, error = result
+    metrics.REQUESTS.inc(target=capture_key, outcome=_outcome(success, vehicles, error))
+    if success and vehicles is not UNCHANGED:
+        metrics.VEHICLES_PER_RESPONSE.observe(len(vehicles), target=capture_key)
+    return result
+
+
+async def _request_exhibition(
+    session,
+    api_config,
+    exhb_no,
+    target_overrides,
+    headers_override,
+    page_no,
+    capture_key,
+):
     url = build_url(api_config, exhb_no)
-    payload = build_payload(api_config, exhb_no, target_overrides)
+    payload = build_payload(api_config, exhb_no, target_overrides, page_no=page_no)
 
-    # 기본 헤더 설정
+    # 기본 헤더 설정 (body는 jsoncodec으로 직접 인코딩하므로 Content-Type 보장)
     headers = dict(headers_override or api_config.get("headers", {}))
+    headers.setdefault("Content-Type", "application/json;charset=utf-8")
     headers.update(
         {
             "Cache-Control": "no-cache",
@@ -77,38 +172,46 @@ async def fetch_exhibition(
         }
     )
 
-    # 보안 토큰 갱신된 값 적용
-    valid_headers = refresher.get_headers()
-    headers.update(valid_headers)
-
-    log_lines = []
-    log_lines.append(f">>> REQUEST: {url}")
-    if "X-UX-State-Key" in headers:
-        log_lines.append(f"TOKEN: {headers['X-UX-State-Key']}")
+    # 보안 토큰: 한 세대의 State-Key와 쿠키를 함께 사용 (요청 도중 갱신돼도 섞이지 않음)
+    auth_headers, cookies = refresher.credentials()
+    headers.update(auth_headers)
+    token = headers.get("X-UX-State-Key", "")
 
     log.info(f"[API] >>> REQUEST: {url}")
 
     try:
-        # curl_cffi를 사용하여 Chrome 지문 위장 요청 (동기 함수이므로 to_thread 사용)
-        resp = await asyncio.to_thread(
-            requests.post,
-            url=url,
-            json=payload,
-            headers=headers,
-            impersonate="chrome110",
-            timeout=20,
-        )
+        # 공유 세션으로 Chrome 지문 위장 요청 (네이티브 비동기, 연결 재사용)
+        with metrics.REQUEST_SECONDS.time(target=capture_key):
+            # 응답 Set-Cookie는 공유 쿠키 저장소에 반영하지 않음 (세대 쿠키만 전송)
+            resp = await session.post(
+                url,
+                data=jsoncodec.dumps(payload),
+                headers=headers,
+                cookies=cookies,
+                discard_cookies=True,
+                timeout=20,
+            )
 
         status_code = resp.status_code
-        text = resp.text
-
         log.info(f"[API] <<< RESPONSE Status: {status_code}")
-        log_lines.append(f"<<< RESPONSE Status: {status_code}")
+        # 원본 바이트 참조만 보관 (렌더링은 조회 시점에 수행)
+        debug_capture.record(
+            capture_key, url, status=status_code, token=token, body=resp.content
+        )
 
+        # 빠른 경로: 직전과 동일한 응답이면 파싱/필터/Diff 생략
+        if status_code == 200:
+            hit = fingerprints.check(capture_key, page_no or 1, resp.content)
+            metrics.FINGERPRINT_CHECKS.inc(
+                target=capture_key, result="hit" if hit else "miss"
+            )
+            if hit:
+                total, _ = fingerprints.cached(capture_key, page_no or 1)
+                return True, UNCHANGED, total, None
+
+        parse_start = time.perf_counter()
         try:
-            raw = resp.json()
-            body_str = json.dumps(raw, ensure_ascii=False, indent=2)
-            log_lines.append(f"BODY: {body_str}")
+            raw = jsoncodec.loads(resp.content)
 
             # 가짜 성공응답(data가 비어있음) 체크
             if raw.get("rspStatus", {}).get("rspCode") == "0000" and (
@@ -117,37 +220,98 @@ async def fetch_exhibition(
                 log.error(
                     "[API] 가짜 응답(Bot Neutralized) 감지됨. TLS 지문 혹은 토큰 확인 필요."
                 )
-                return (
-                    False,
-                    [],
-                    0,
-                    "봇 탐지 패치 (가짜 응답)",
-                    "\n".join(log_lines),
-                )
+                return False, [], 0, "봇 탐지 패치 (가짜 응답)"
 
         except Exception:
-            log.info(f"[API] BODY: (Raw) {text[:500]}")
-            log_lines.append(f"BODY: (Raw) {text[:500]}")
-            return False, [], 0, "JSON 파싱 실패", "\n".join(log_lines)
+            log.info(f"[API] BODY: (Raw) {resp.text[:500]}")
+            return False, [], 0, "JSON 파싱 실패"
 
         if status_code != 200:
-            return False, [], 0, f"HTTP {status_code}", "\n".join(log_lines)
+            return False, [], 0, f"HTTP {status_code}"
 
     except Exception as e:
         log.error(f"[API] 요청 에러: {e}")
-        log_lines.append(f"ERROR: {type(e).__name__} - {e}")
-        return False, [], 0, f"요청 실패: {type(e).__name__}", "\n".join(log_lines)
+        debug_capture.record(
+            capture_key, url, token=token, error=f"{type(e).__name__} - {e}"
+        )
+        return False, [], 0, f"요청 실패: {type(e).__name__}"
 
     result = parse_response(raw)
-    return result[0], result[1], result[2], result[3], "\n".join(log_lines)
+    metrics.PARSE_SECONDS.observe(time.perf_counter() - parse_start, target=capture_key)
+    return result
+
+
+async def fetch_exhibition_pages(
+    session,
+    api_config,
+    exhb_no,
+    target_overrides=None,
+    headers_override=None,
+    capture_key=None,
+    acquire=None,
+):
+    """
+    기획전 전체 페이지 스트리밍 조회 (async generator).
+    1페이지의 totalCount로 전체 페이지 수를 계산한 뒤 나머지 페이지를 동시에 요청하고,
+    도착하는 순서대로 (page_no, success, vehicles, total, error)를 yield 한다.
+    acquire가 주어지면 2페이지 이후 요청마다 먼저 await acquire() (요청 예산 확보).
+    """
+    first = await fetch_exhibition(
+        session,
+        api_config,
+        exhb_no,
+        target_overrides=target_overrides,
+        headers_override=headers_override,
+        page_no=1,
+        capture_key=capture_key,
+    )
+    yield (1, *first)
+
+    success, _, total, _ = first
+    if not success:
+        return
+    pages = page_count(api_config, total)
+    if pages <= 1:
+        return
+
+    sem = asyncio.Semaphore(
+        int(api_config.get("pageConcurrency", DEFAULT_PAGE_CONCURRENCY))
+    )
+
+    async def _fetch_page(page_no):
+        async with sem:
+            if acquire is not None:
+                await acquire()
+            result = await fetch_exhibition(
+                session,
+                api_config,
+                exhb_no,
+                target_overrides=target_overrides,
+                headers_override=headers_override,
+                page_no=page_no,
+                capture_key=capture_key,
+            )
+        return (page_no, *result)
+
+    tasks = [asyncio.create_task(_fetch_page(no)) for no in range(2, pages + 1)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 def build_detail_url(vehicle, exhb_no=""):
     """차량 상세/구매 페이지 URL 생성 (공식 패턴)."""
-    yymm = vehicle.get("criterionYearMonth", "") if isinstance(vehicle, dict) else ""
-    prod_no = (
-        vehicle.get("carProductionNumber", "") if isinstance(vehicle, dict) else ""
-    )
+    if isinstance(vehicle, Vehicle):
+        yymm, prod_no = vehicle.yymm, vehicle.prod_no
+        vehicle = vehicle.vehicle_id
+    elif isinstance(vehicle, dict):
+        yymm = vehicle.get("criterionYearMonth", "")
+        prod_no = vehicle.get("carProductionNumber", "")
+    else:
+        yymm = prod_no = ""
 
     if yymm and prod_no:
         base = "https://casper.hyundai.com/vehicles/car-list/detail"
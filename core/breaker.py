@@ -0,0 +1,111 @@
+"""
+서킷 브레이커 모듈
+기획전별로 연속 실패/WAF 차단 시 조회를 잠시 멈추고(open), 대기 후 1건만 시험 조회(half-open)하여
+성공하면 정상(closed)으로 복귀합니다. 다시 실패하면 대기 시간을 지수적으로 늘립니다.
+
+차단 중에도 API를 계속 두드려 차단이 길어지는 것을 막기 위한 용도입니다.
+"""
+
+import logging
+import time
+
+log = logging.getLogger("CasperFinder")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+DEFAULT_FAILURE_THRESHOLD = 3  # 일반 실패는 연속 N회에서 open
+DEFAULT_BASE_COOLDOWN = 15.0  # 첫 open 대기 (초)
+DEFAULT_MAX_COOLDOWN = 600.0
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        key,
+        failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+        base_cooldown=DEFAULT_BASE_COOLDOWN,
+        max_cooldown=DEFAULT_MAX_COOLDOWN,
+    ):
+        self.key = key
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+        self.probing = False
+
+    def ready(self):
+        """지금 조회해도 되는지 (상태 변경 없음)."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return time.monotonic() >= self.open_until
+        return not self.probing
+
+    def on_dispatch(self):
+        """조회 시작 시 호출. open 대기가 끝났으면 half-open 시험 조회로 전환."""
+        if self.state == OPEN and time.monotonic() >= self.open_until:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            self.probing = True
+
+    def record(self, success, blocked=False):
+        """조회 결과 반영."""
+        self.probing = False
+        if success:
+            if self.state != CLOSED:
+                log.info(f"[Breaker] {self.key} 복구 (closed)")
+            self.state = CLOSED
+            self.failures = 0
+            self.trips = 0
+            return
+
+        self.failures += 1
+        if (
+            self.state == HALF_OPEN
+            or blocked
+            or self.failures >= self.failure_threshold
+        ):
+            self._trip()
+
+    def _trip(self):
+        cooldown = min(self.base_cooldown * (2**self.trips), self.max_cooldown)
+        self.trips += 1
+        self.state = OPEN
+        self.open_until = time.monotonic() + cooldown
+        log.warning(f"[Breaker] {self.key} 차단 (open) — {cooldown:.0f}초 후 시험 조회")
+
+    def describe(self):
+        if self.state == CLOSED:
+            return CLOSED
+        if self.state == OPEN:
+            remain = max(0.0, self.open_until - time.monotonic())
+            return f"{OPEN} ({remain:.0f}s)"
+        return HALF_OPEN
+
+
+class BreakerRegistry:
+    def __init__(self):
+        self._breakers = {}
+
+    def get(self, key):
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(key)
+        return breaker
+
+    def reset(self, key):
+        """기획전 브레이커 초기화 (설정 변경 후 재초기화 시)."""
+        self._breakers.pop(key, None)
+
+    def describe(self, key):
+        breaker = self._breakers.get(key)
+        return breaker.describe() if breaker else CLOSED
+
+
+# 싱글톤
+breakers = BreakerRegistry()
@@ -0,0 +1,257 @@
+"""
+다중 인스턴스 조정 모듈
+여러 봇 인스턴스(서로 다른 LXC/IP)가 조회를 나눠 맡아 전체 조회 빈도를 수평 확장합니다.
+
+- split 모드: 기획전을 인스턴스 수로 나눠 각자 맡은 기획전만 조회 (exhbNo 해시 기준)
+- interleave 모드: 모든 인스턴스가 모든 기획전을 조회하되 주기를 인스턴스 수로 나눈 슬롯에 맞춰
+  서로 어긋나게 조회 (같은 기획전의 실질 조회 주기가 1/N)
+- 신규 차량 알림은 공유 claim 로그에 먼저 등록(claim)한 인스턴스만 전송 → 정확히 1회 알림
+- 상태 보고 등 1곳에서만 해야 하는 작업은 리더 임대(lease)를 가진 인스턴스가 수행
+
+조정 저장소는 SQLite(같은 호스트/공유 디스크의 파일 1개, 기본) 또는 Redis(redis 패키지 설치 시).
+저장소 모듈(sqlite3/redis)은 cluster.enabled 일 때만 import 합니다.
+SQLite 호출(잠금 대기 포함)은 전용 스레드 1개에서 실행해 이벤트 루프를 막지 않습니다.
+"""
+
+import asyncio
+import logging
+import math
+import random
+import socket
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+log = logging.getLogger("CasperFinder")
+
+SPLIT = "split"
+INTERLEAVE = "interleave"
+# claim 보관 시간 (초). 이 시간 안에 다시 올라온 같은 차량은 재알림 안 함
+DEFAULT_CLAIM_TTL = 3600
+DEFAULT_LEASE_TTL = 30  # 리더 임대 유지 시간 (초), 갱신은 LEASE_RENEW_EVERY 마다
+LEASE_RENEW_EVERY = 10
+PRUNE_EVERY = 300  # SQLite 만료 claim 정리 주기 (초)
+
+
+class SqliteBackend:
+    """공유 SQLite 파일 기반 claim 로그/리더 임대 (WAL 모드, 프로세스 간 잠금은 SQLite가 처리).
+
+    다른 인스턴스가 쓰기 잠금을 잡고 있으면 최대 timeout초 대기하므로,
+    연결은 전용 스레드 1개에서만 사용하고 async 메서드는 그 스레드의 결과를 기다린다.
+    """
+
+    def __init__(self, path):
+        import sqlite3
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="cluster-sqlite"
+        )
+        self._db = sqlite3.connect(
+            str(path), timeout=5, isolation_level=None, check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS claims ("
+            " exhb_no TEXT, vehicle_id TEXT, instance TEXT, claimed_at REAL,"
+            " PRIMARY KEY (exhb_no, vehicle_id))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS leases ("
+            " name TEXT PRIMARY KEY, instance TEXT, expires_at REAL)"
+        )
+        self._last_prune = 0.0
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def claim(self, instance, exhb_no, ids, ttl):
+        return await self._run(self._claim, instance, exhb_no, ids, ttl)
+
+    def _claim(self, instance, exhb_no, ids, ttl):
+        now = time.time()
+        db = self._db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if now - self._last_prune > PRUNE_EVERY:
+                db.execute("DELETE FROM claims WHERE claimed_at < ?", (now - ttl,))
+                self._last_prune = now
+            won = []
+            for vid in ids:
+                # 만료된 claim은 덮어쓰기, 유효한 claim은 유지
+                cur = db.execute(
+                    "INSERT INTO claims VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (exhb_no, vehicle_id) DO UPDATE SET"
+                    " instance = excluded.instance, claimed_at = excluded.claimed_at"
+                    " WHERE claims.claimed_at < ?",
+                    (exhb_no, vid, instance, now, now - ttl),
+                )
+                if cur.rowcount:
+                    won.append(vid)
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return won
+
+    async def acquire_lease(self, instance, name, ttl):
+        return await self._run(self._acquire_lease, instance, name, ttl)
+
+    def _acquire_lease(self, instance, name, ttl):
+        now = time.time()
+        cur = self._db.execute(
+            "INSERT INTO leases VALUES (?, ?, ?)"
+            " ON CONFLICT (name) DO UPDATE SET"
+            " instance = excluded.instance, expires_at = excluded.expires_at"
+            " WHERE leases.instance = excluded.instance OR leases.expires_at < ?",
+            (name, instance, now + ttl, now),
+        )
+        return cur.rowcount > 0
+
+    async def close(self):
+        await self._run(self._db.close)
+        self._executor.shutdown()
+
+
+class RedisBackend:
+    """Redis(또는 호환 서버) 기반 claim 로그/리더 임대 (SET NX EX)."""
+
+    def __init__(self, url):
+        import redis.asyncio as aioredis
+
+        self._redis = aioredis.from_url(url)
+
+    async def claim(self, instance, exhb_no, ids, ttl):
+        pipe = self._redis.pipeline(transaction=False)
+        for vid in ids:
+            pipe.set(f"casperfinder:claim:{exhb_no}:{vid}", instance, nx=True, ex=ttl)
+        results = await pipe.execute()
+        return [vid for vid, ok in zip(ids, results) if ok]
+
+    async def acquire_lease(self, instance, name, ttl):
+        key = f"casperfinder:lease:{name}"
+        if await self._redis.set(key, instance, nx=True, ex=ttl):
+            return True
+        owner = await self._redis.get(key)
+        if owner is not None and owner.decode() == instance:
+            await self._redis.expire(key, ttl)
+            return True
+        return False
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+class Cluster:
+    def __init__(self):
+        self.enabled = False
+        self.instance_id = socket.gethostname()
+        self.mode = SPLIT
+        self.shards = 1
+        self.shard_index = 0
+        self.claim_ttl = DEFAULT_CLAIM_TTL
+        self.lease_ttl = DEFAULT_LEASE_TTL
+        self.leader = True
+        self._backend = None
+
+    def configure(self, cluster_config, default_path):
+        """config.json의 "cluster" 섹션 적용. 섹션이 없거나 enabled=false면 단일 인스턴스."""
+        cluster_config = cluster_config or {}
+        if not cluster_config.get("enabled"):
+            return
+        self.enabled = True
+        self.leader = False
+        self.shards = max(1, int(cluster_config.get("shards", 1)))
+        self.shard_index = int(cluster_config.get("shardIndex", 0)) % self.shards
+        self.instance_id = str(
+            cluster_config.get("instanceId") or f"{self.instance_id}-{self.shard_index}"
+        )
+        self.mode = cluster_config.get("mode", SPLIT)
+        self.claim_ttl = int(cluster_config.get("claimTtl", self.claim_ttl))
+        self.lease_ttl = int(cluster_config.get("leaseTtl", self.lease_ttl))
+
+        backend = cluster_config.get("backend", "sqlite")
+        if backend == "redis":
+            try:
+                self._backend = RedisBackend(
+                    cluster_config.get("redisUrl", "redis://localhost:6379/0")
+                )
+            except ImportError:  # 선택 의존성
+                log.error("[Cluster] redis 패키지가 없어 SQLite 백엔드를 사용합니다.")
+                backend = "sqlite"
+        if backend != "redis":
+            path = cluster_config.get("path")
+            self._backend = SqliteBackend(Path(path) if path else default_path)
+        log.info(
+            f"[Cluster] 인스턴스 {self.instance_id} — {self.mode} 모드, "
+            f"샤드 {self.shard_index + 1}/{self.shards}, 백엔드 {backend}"
+        )
+
+    # ── 조회 분담 ──
+    def owns(self, exhb_no):
+        """이 인스턴스가 조회할 기획전인지 (split 모드에서만 분할)."""
+        if not self.enabled or self.mode != SPLIT or self.shards == 1:
+            return True
+        return zlib.crc32(exhb_no.encode()) % self.shards == self.shard_index
+
+    def align(self, run_at, interval, jitter):
+        """interleave 모드: 다음 조회 시각을 이 인스턴스의 슬롯으로 맞춤.
+
+        벽시계 기준 interval/shards 길이 슬롯을 인스턴스가 돌아가며 사용한다.
+        run_at은 time.monotonic() 기준.
+        """
+        slot = interval / self.shards
+        offset = time.time() - time.monotonic()
+        n = math.ceil((run_at + offset) / slot)
+        n += (self.shard_index - n) % self.shards
+        return n * slot - offset + random.uniform(0, min(jitter, slot / 4))
+
+    @property
+    def interleaved(self):
+        return self.enabled and self.mode == INTERLEAVE and self.shards > 1
+
+    # ── 중복 알림 방지 ──
+    async def claim(self, exhb_no, ids):
+        """신규 차량 ID 중 이 인스턴스가 알림을 맡게 된 ID 목록.
+
+        저장소 오류 시에는 누락보다 중복이 낫다고 보고 전체를 반환.
+        """
+        if not self.enabled or not ids:
+            return list(ids)
+        try:
+            return await self._backend.claim(
+                self.instance_id, exhb_no, list(ids), self.claim_ttl
+            )
+        except Exception as e:
+            log.error(f"[Cluster] claim 실패 (전체 알림): {e!r}")
+            return list(ids)
+
+    async def renew_lease(self):
+        """리더 임대 획득/갱신 후 self.leader 갱신 (LEASE_RENEW_EVERY 초마다 호출)."""
+        if not self.enabled:
+            return True
+        try:
+            leader = await self._backend.acquire_lease(
+                self.instance_id, "leader", self.lease_ttl
+            )
+        except Exception as e:
+            log.error(f"[Cluster] 리더 임대 확인 실패: {e!r}")
+            leader = False
+        if leader != self.leader:
+            log.info(
+                f"[Cluster] 리더 {'획득' if leader else '상실'}: {self.instance_id}"
+            )
+        self.leader = leader
+        return leader
+
+    async def close(self):
+        if self._backend is not None:
+            await self._backend.close()
+            self._backend = None
+
+
+# 싱글톤
+cluster = Cluster()
@@ -5,41 +5,112 @@
 변경 사항:
 - Windows %LOCALAPPDATA% 경로 → 프로젝트 내 상대 경로
 - Windows 전용 코드 제거
+- 원자적 저장(임시 파일 → fsync → rename) 및 지연 병합 저장(coalescing)
 """
 
-import json
+import asyncio
+import atexit
 import logging
+import os
+import shutil
 from pathlib import Path
 
+from core import jsoncodec
+
 log = logging.getLogger("CasperFinder")
 
 BASE_DIR = Path(__file__).parent.parent
-CONFIG_PATH = BASE_DIR / "config.json"
-DATA_DIR = BASE_DIR / "data"
+# 환경 변수로 설정/데이터 경로 변경 가능 (벤치마크·다중 인스턴스용)
+CONFIG_PATH = Path(os.environ.get("CASPERFINDER_CONFIG", BASE_DIR / "config.json"))
+DATA_DIR = Path(os.environ.get("CASPERFINDER_DATA_DIR", BASE_DIR / "data"))
 KNOWN_VEHICLES_PATH = DATA_DIR / "known_vehicles.json"
+KNOWN_VEHICLES_JOURNAL_PATH = DATA_DIR / "known_vehicles.journal"
+DEBUG_DUMP_PATH = DATA_DIR / "api_debug_dump.txt"
+SCHEDULER_STATE_PATH = DATA_DIR / "scheduler_state.json"
+CLUSTER_DB_PATH = DATA_DIR / "cluster.db"
+IPC_SOCKET_PATH = DATA_DIR / "ipc.sock"
+TOKEN_STATE_PATH = DATA_DIR / "token_state.json"
+DASHBOARD_STATE_PATH = DATA_DIR / "dashboard.json"
+EVENTS_PATH = DATA_DIR / "events.jsonl"
+
+COALESCE_DELAY = 1.0  # 지연 저장 병합 구간 (초)
+
+_pending_saves = {}
+_flush_handle = None
 
 
 def load_json(path, default=None):
-    """JSON 파일 로드. 없으면 default 반환."""
+    """JSON 파일 로드. 없으면 default 반환.
+
+    파일이 손상된 경우 .corrupt 사본을 남기고 에러를 기록한 뒤 default 반환.
+    """
     if default is None:
         default = {}
     if path.exists():
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
+            with open(path, "rb") as f:
+                return jsoncodec.loads(f.read())
+        except Exception as e:
+            corrupt = path.with_name(path.name + ".corrupt")
+            log.error(f"로드 실패 ({path}): {e} — {corrupt.name} 사본 보존")
+            try:
+                shutil.copyfile(path, corrupt)
+            except OSError:
+                pass
             return default
     return default
 
 
-def save_json(path, data):
-    """JSON 파일 저장. 디렉토리 자동 생성."""
+def save_json(path, data, indent=2):
+    """JSON 파일 원자적 저장. 디렉토리 자동 생성. 성공 여부 반환.
+    indent는 None(압축) 또는 들여쓰기 사용(2칸 고정) 여부로 취급.
+
+    임시 파일에 기록 → fsync → rename 순서로 교체하므로
+    쓰기 도중 크래시가 나도 기존 파일이 그대로 남는다.
+    """
+    tmp = path.with_name(path.name + ".tmp")
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(tmp, "wb") as f:
+            f.write(jsoncodec.dumps(data, indent=indent))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return True
     except Exception as e:
         log.error(f"저장 실패 ({path}): {e}")
+        return False
+
+
+def save_json_later(path, data, delay=COALESCE_DELAY):
+    """지연 저장. delay초 안에 들어온 저장 요청들을 모아 path별 마지막 값만 1회 기록.
+
+    data 대신 호출 시 데이터를 반환하는 callable을 넘길 수 있다 (기록 시점에 평가).
+    실행 중인 이벤트 루프가 없으면 즉시 기록한다.
+    """
+    global _flush_handle
+    _pending_saves[path] = data
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        flush_pending()
+        return
+    if _flush_handle is None:
+        _flush_handle = loop.call_later(delay, flush_pending)
+
+
+def flush_pending():
+    """대기 중인 지연 저장을 즉시 기록 (종료 시 호출)."""
+    global _flush_handle
+    if _flush_handle is not None:
+        _flush_handle.cancel()
+        _flush_handle = None
+    while _pending_saves:
+        path, data = _pending_saves.popitem()
+        save_json(path, data() if callable(data) else data)
+
+
+atexit.register(flush_pending)
 
 
 def load_config():
@@ -50,6 +121,106 @@ def load_config():
     return load_json(CONFIG_PATH)
 
 
+def read_config():
+    """config.json 엄격 로드 (재적용용). 파일이 없거나 JSON이 잘못되면 예외."""
+    with open(CONFIG_PATH, "rb") as f:
+        return jsoncodec.loads(f.read())
+
+
+def config_stamp():
+    """config.json 변경 감지용 (mtime_ns, size). 파일이 없으면 None."""
+    try:
+        st = os.stat(CONFIG_PATH)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _check_numbers(errors, section, name, **kinds):
+    """선택 숫자 항목 형식 검사 (kinds: 키 → int | float | 0)."""
+    if not isinstance(section, dict):
+        errors.append(f"{name}가 객체가 아님")
+        return
+    for key, kind in kinds.items():
+        value = section.get(key)
+        if value is None:
+            continue
+        if kind is int:
+            ok = isinstance(value, int) and not isinstance(value, bool) and value > 0
+            expected = "양의 정수"
+        else:
+            ok = isinstance(value, (int, float)) and not isinstance(value, bool)
+            ok = ok and (value >= 0 if kind == 0 else value > 0)
+            expected = "0 이상의 숫자" if kind == 0 else "양수"
+        if not ok:
+            errors.append(f"{name}.{key}가 {expected}가 아님")
+
+
+def validate_config(config):
+    """필수 항목/형식 검사. 문제 목록 반환 (비어 있으면 정상)."""
+    errors = []
+    if not isinstance(config, dict):
+        return ["최상위가 객체가 아님"]
+
+    discord_config = config.get("discord")
+    if not isinstance(discord_config, dict) or not discord_config.get("token"):
+        errors.append("discord.token 없음")
+    elif not str(discord_config.get("integratedChannelId", "")).isdigit():
+        errors.append("discord.integratedChannelId가 숫자가 아님")
+
+    api_config = config.get("api")
+    if not isinstance(api_config, dict) or not api_config.get("baseUrl"):
+        errors.append("api.baseUrl 없음")
+    else:
+        for key in ("headers", "defaultPayload"):
+            if not isinstance(api_config.get(key, {}), dict):
+                errors.append(f"api.{key}가 객체가 아님")
+
+        for key in ("mainUrl", "layoutSyncUrl"):
+            if not isinstance(api_config.get(key, ""), str):
+                errors.append(f"api.{key}가 문자열이 아님")
+        _check_numbers(errors, api_config, "api", queryConcurrency=int)
+
+    # 재시작 없이 적용되는 숫자 설정 (int: 양의 정수, float: 양수, 0: 0 이상)
+    _check_numbers(
+        errors,
+        config.get("poll", {}),
+        "poll",
+        baseInterval=float,
+        minInterval=float,
+        maxInterval=float,
+        jitter=0,
+        requestsPerMinute=int,
+    )
+    _check_numbers(
+        errors, config.get("debug", {}), "debug", maxEntries=int, maxBytes=int
+    )
+    _check_numbers(errors, config.get("profile", {}), "profile", cycles=int, top=int)
+    _check_numbers(errors, config.get("events", {}), "events", maxEntries=int)
+    _check_numbers(errors, config.get("status", {}), "status", interval=float)
+
+    targets = config.get("targets")
+    if not isinstance(targets, list):
+        return errors + ["targets가 목록이 아님"]
+    seen = set()
+    for i, target in enumerate(targets):
+        if not isinstance(target, dict):
+            errors.append(f"targets[{i}]가 객체가 아님")
+            continue
+        name = target.get("label") or f"targets[{i}]"
+        for key in ("exhbNo", "label"):
+            if not isinstance(target.get(key), str) or not target[key]:
+                errors.append(f"{name}: {key} 없음")
+        if not str(target.get("channelId", "")).isdigit():
+            errors.append(f"{name}: channelId가 숫자가 아님")
+        for key in ("exhbNo", "label"):
+            value = target.get(key)
+            if isinstance(value, str) and (key, value) in seen:
+                errors.append(f"{name}: {key} 중복 ({value})")
+            seen.add((key, str(value)))
+    return errors
+
+
 def save_config(config):
     """config.json 저장."""
-    save_json(CONFIG_PATH, config)
+    return save_json(CONFIG_PATH, config)
@@ -0,0 +1,116 @@
+"""
+상태 대시보드 모듈
+주기마다 상태 보고 메시지를 새로 보내는 대신, 상태 채널의 고정(pin) 메시지 1개를 제자리에서 수정합니다.
+
+- 메시지 ID는 data/dashboard.json 에 저장해 재시작 후에도 같은 메시지를 수정
+- 메시지가 삭제됐거나(NotFound) 상태 채널이 바뀌면 새로 보내고 고정, 이전 메시지는 고정 해제
+  (그 밖의 수정 실패는 메시지를 유지하고 다음 주기에 다시 수정)
+- 요청 지연 분위수는 직전 갱신 이후 구간의 히스토그램 증가분으로 계산
+- API 로그 전문은 대시보드에 넣지 않고 gzip 압축 파일 1개로 첨부 (요청 시/오류 발생 시)
+"""
+
+import gzip
+import io
+import logging
+
+import discord
+
+from core import metrics
+from core.config import DASHBOARD_STATE_PATH, load_json, save_json
+from core.ipc import RemoteError
+
+log = logging.getLogger("CasperFinder")
+
+MAX_MESSAGE_CHARS = 2000
+
+
+def compressed_file(text, filename="api_debug.txt"):
+    """텍스트를 gzip 압축한 Discord 첨부 파일 (<filename>.gz)."""
+    data = gzip.compress(text.encode("utf-8"))
+    return discord.File(io.BytesIO(data), filename=f"{filename}.gz")
+
+
+def fit(lines, limit=MAX_MESSAGE_CHARS):
+    """메시지 길이 제한에 맞게 뒤쪽 줄부터 생략."""
+    text = "\n".join(lines)
+    while len(text) > limit and len(lines) > 1:
+        lines = lines[:-1]
+        text = "\n".join(lines + ["…"])
+    return text[:limit]
+
+
+def _message_gone(error):
+    """수정 대상 메시지가 삭제됨 (IPC 경유면 Discord 프로세스에서 난 NotFound)."""
+    if isinstance(error, RemoteError):
+        return error.is_a(discord.NotFound)
+    return isinstance(error, discord.NotFound)
+
+
+class StatusDashboard:
+    def __init__(self, state_path=DASHBOARD_STATE_PATH):
+        self.state_path = state_path
+        state = load_json(state_path, {})
+        self.channel_id = state.get("channelId")
+        self.message_id = state.get("messageId")
+        self._latency_base = {}
+        self._error_labels = set()
+
+    # ── 메시지 ──
+    async def update(self, channel, content, get_channel=None):
+        """대시보드 메시지 수정 (없거나 삭제됐으면 새로 보내고 고정).
+
+        삭제(NotFound) 외의 수정 실패는 메시지를 그대로 두고 다음 주기에 다시 수정한다.
+        get_channel: 채널 ID → 채널. 상태 채널이 바뀌었을 때 이전 메시지 고정 해제에 사용.
+        """
+        stale = None  # 고정 해제할 이전 메시지 (채널 ID, 메시지 ID)
+        if self.message_id and self.channel_id == channel.id:
+            try:
+                await channel.get_partial_message(self.message_id).edit(content=content)
+                return
+            except Exception as e:
+                if not _message_gone(e):
+                    log.warning(
+                        f"[Dashboard] 메시지 수정 실패 — 다음 주기에 재시도: {e}"
+                    )
+                    return
+                log.warning("[Dashboard] 대시보드 메시지가 삭제됨 — 새로 게시")
+        elif self.message_id:
+            stale = (self.channel_id, self.message_id)
+
+        message = await channel.send(content=content)
+        self.channel_id, self.message_id = channel.id, message.id
+        save_json(
+            self.state_path,
+            {"channelId": self.channel_id, "messageId": self.message_id},
+        )
+        try:
+            await message.pin()
+        except Exception as e:
+            log.warning(f"[Dashboard] 메시지 고정 실패 (권한 확인): {e}")
+        if stale and get_channel is not None:
+            try:
+                await get_channel(stale[0]).get_partial_message(stale[1]).unpin()
+            except Exception as e:
+                log.warning(f"[Dashboard] 이전 메시지 고정 해제 실패: {e}")
+
+    # ── 구간 통계 ──
+    def latency_window(self):
+        """직전 호출 이후 쌓인 요청 지연 버킷 개수 {query_key: [개수...]} (기준점 갱신)."""
+        current = metrics.REQUEST_SECONDS.snapshot()
+        window = {}
+        for key, counts in current.items():
+            base = self._latency_base.get(key)
+            window[key[0]] = [c - b for c, b in zip(counts, base)] if base else counts
+        self._latency_base = current
+        return window
+
+    def new_errors(self, labels):
+        """이번 갱신에서 새로 오류 상태가 된 기획전 (직전 갱신에도 오류였으면 제외)."""
+        labels = set(labels)
+        fresh = labels - self._error_labels
+        self._error_labels = labels
+        return sorted(fresh)
+
+
+# 싱글톤
+dashboard = StatusDashboard()
@@ -0,0 +1,108 @@
+"""
+디버그 캡처 모듈
+기획전별 API 요청/응답 원본(bytes)을 고정 크기 링 버퍼에 보관하고,
+상태 보고·슬래시 명령·덤프 파일 등 실제로 요청될 때만 사람이 읽을 수 있는 형태로 렌더링합니다.
+
+폴링 경로에서는 응답 바이트 참조만 저장하므로 직렬화/문자열 할당 비용이 없습니다.
+"""
+
+import logging
+import time
+from collections import deque
+from datetime import datetime
+
+from core import jsoncodec
+
+log = logging.getLogger("CasperFinder")
+
+DEFAULT_MAX_ENTRIES = 8  # 기획전당 보관 건수
+DEFAULT_MAX_BYTES = 256 * 1024  # 기획전당 보관 바이트
+
+
+class CaptureEntry:
+    __slots__ = ("ts", "url", "status", "token", "body", "error")
+
+    def __init__(self, url, status=None, token="", body=b"", error=None):
+        self.ts = time.time()
+        self.url = url
+        self.status = status
+        self.token = token
+        self.body = body or b""
+        self.error = error
+
+    def render(self):
+        """요청/응답 내용을 사람이 읽을 수 있는 텍스트로 변환."""
+        stamp = datetime.fromtimestamp(self.ts).strftime("%H:%M:%S")
+        lines = [f">>> REQUEST: {self.url} ({stamp})"]
+        if self.token:
+            lines.append(f"TOKEN: {self.token}")
+        if self.status is not None:
+            lines.append(f"<<< RESPONSE Status: {self.status}")
+        if self.error:
+            lines.append(f"ERROR: {self.error}")
+        if self.body:
+            try:
+                body_str = jsoncodec.dumps_str(jsoncodec.loads(self.body), indent=2)
+                lines.append(f"BODY: {body_str}")
+            except Exception:
+                text = self.body[:500].decode("utf-8", errors="replace")
+                lines.append(f"BODY: (Raw) {text}")
+        return "\n".join(lines)
+
+
+class DebugCapture:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._buffers = {}
+        self._sizes = {}
+
+    def configure(self, max_entries=None, max_bytes=None):
+        """보관 한도 설정. 기존 버퍼는 다음 기록 시점부터 새 한도로 정리."""
+        if max_entries:
+            self.max_entries = int(max_entries)
+        if max_bytes:
+            self.max_bytes = int(max_bytes)
+
+    def record(self, key, url, status=None, token="", body=b"", error=None):
+        """요청 1건 기록. 건수/바이트 한도를 넘으면 오래된 항목부터 제거."""
+        buf = self._buffers.setdefault(key, deque())
+        entry = CaptureEntry(url, status=status, token=token, body=body, error=error)
+        buf.append(entry)
+        size = self._sizes.get(key, 0) + len(entry.body)
+        while buf and (
+            len(buf) > self.max_entries or (size > self.max_bytes and len(buf) > 1)
+        ):
+            size -= len(buf.popleft().body)
+        self._sizes[key] = size
+
+    def keys(self):
+        return list(self._buffers.keys())
+
+    def render(self, key, max_chars=None):
+        """key의 캡처 내용을 최신순으로 렌더링. max_chars 지정 시 해당 길이에서 절단."""
+        parts = []
+        used = 0
+        for entry in reversed(self._buffers.get(key, ())):
+            text = entry.render()
+            parts.append(text)
+            used += len(text) + 1
+            if max_chars and used >= max_chars:
+                break
+        rendered = "\n".join(parts)
+        if max_chars and len(rendered) > max_chars:
+            rendered = rendered[:max_chars] + "\n...(중략)"
+        return rendered
+
+    def dump(self, path):
+        """전체 캡처 내용을 파일로 저장하고 경로 반환."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for key in self.keys():
+                f.write(f"===== {key} =====\n{self.render(key)}\n\n")
+        log.info(f"[Debug] 캡처 덤프 저장: {path}")
+        return path
+
+
+# 싱글톤
+debug_capture = DebugCapture()
@@ -0,0 +1,192 @@
+"""
+알림 전송 모듈 (Discord 디스패처)
+폴링 루프와 분리된 채널별 전송 큐를 운영합니다.
+
+- 채널별 큐에 쌓인 Embed를 짧은 구간 동안 모아 메시지 1건당 최대 10개씩 묶어 전송
+- 채널(= Discord 라우트)별 워커가 동시에 동작하므로 통합/기획전 채널 전송이 서로 기다리지 않음
+- 채널별 레이트리밋 버킷(기본 5건/5초)을 자체 추적하고, 429 응답 시 retry_after 만큼 정지
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+
+import discord
+
+from core import metrics
+
+log = logging.getLogger("CasperFinder")
+
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+DEFAULT_BATCH_WINDOW = 0.2  # 첫 Embed 이후 추가 Embed를 기다리는 시간 (초)
+DEFAULT_ROUTE_LIMIT = 5  # 채널당 메시지 전송 한도
+DEFAULT_ROUTE_PER = 5.0  # 한도 적용 구간 (초)
+MAX_SEND_ATTEMPTS = 3
+
+
+class RouteBucket:
+    """채널 1개(POST /channels/{id}/messages)의 전송 한도 추적."""
+
+    def __init__(self, limit=DEFAULT_ROUTE_LIMIT, per=DEFAULT_ROUTE_PER):
+        self.limit = limit
+        self.per = per
+        self._sent = deque()
+        self._blocked_until = 0.0
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            while self._sent and now - self._sent[0] >= self.per:
+                self._sent.popleft()
+            if self._blocked_until > now:
+                await asyncio.sleep(self._blocked_until - now)
+            elif len(self._sent) < self.limit:
+                self._sent.append(now)
+                return
+            else:
+                await asyncio.sleep(self._sent[0] + self.per - now)
+
+    def block(self, retry_after):
+        """429 수신 시 retry_after초 동안 전송 중지."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+
+class NotificationDispatcher:
+    def __init__(
+        self,
+        content="@everyone",
+        batch_window=DEFAULT_BATCH_WINDOW,
+        route_limit=DEFAULT_ROUTE_LIMIT,
+        route_per=DEFAULT_ROUTE_PER,
+    ):
+        self.content = content
+        self.batch_window = batch_window
+        self.route_limit = route_limit
+        self.route_per = route_per
+        self._resolver = None
+        self._queues = {}
+        self._workers = {}
+        self._buckets = {}
+        self._carry = {}
+        self.sent_messages = 0
+        self.sent_embeds = 0
+
+    def start(self, resolver):
+        """채널 ID → 채널 객체 조회 함수 등록 (예: bot.get_channel)."""
+        self._resolver = resolver
+
+    def submit(self, channel_ids, embeds):
+        """Embed 목록을 각 채널 큐에 추가 (대기 없이 즉시 반환)."""
+        for channel_id in dict.fromkeys(channel_ids):
+            if not channel_id:
+                continue
+            queue = self._queues.get(channel_id)
+            if queue is None:
+                queue = self._queues[channel_id] = asyncio.Queue()
+                self._buckets[channel_id] = RouteBucket(
+                    self.route_limit, self.route_per
+                )
+            for embed in embeds:
+                queue.put_nowait(embed)
+            worker = self._workers.get(channel_id)
+            if worker is None or worker.done():
+                self._workers[channel_id] = asyncio.create_task(
+                    self._worker(channel_id)
+                )
+
+    def depth(self):
+        """전송 대기 중인 Embed 수."""
+        return sum(q.qsize() for q in self._queues.values()) + len(self._carry)
+
+    async def _collect(self, channel_id):
+        """큐에서 메시지 1건 분량의 Embed 묶음 수집."""
+        queue = self._queues[channel_id]
+        loop = asyncio.get_running_loop()
+        first = self._carry.pop(channel_id, None)
+        if first is None:
+            first = await queue.get()
+        batch = [first]
+        chars = len(first)
+        deadline = loop.time() + self.batch_window
+        while len(batch) < MAX_EMBEDS_PER_MESSAGE:
+            try:
+                embed = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    embed = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if chars + len(embed) > MAX_EMBED_CHARS_PER_MESSAGE:
+                # 글자 수 한도 초과분은 다음 메시지의 첫 Embed로
+                self._carry[channel_id] = embed
+                break
+            batch.append(embed)
+            chars += len(embed)
+        return batch
+
+    async def _worker(self, channel_id):
+        queue = self._queues[channel_id]
+        while True:
+            batch = await self._collect(channel_id)
+            try:
+                await self._send(channel_id, batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _send(self, channel_id, batch):
+        channel = self._resolver(channel_id) if self._resolver else None
+        if channel is None:
+            log.error(f"[알림] 채널을 찾을 수 없음: {channel_id} ({len(batch)}건 폐기)")
+            return
+
+        bucket = self._buckets[channel_id]
+        for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+            await bucket.acquire()
+            start = time.perf_counter()
+            try:
+                await channel.send(content=self.content, embeds=batch)
+                metrics.NOTIFY_SEND_SECONDS.observe(
+                    time.perf_counter() - start, outcome="ok"
+                )
+                metrics.NOTIFY_EMBEDS.inc(len(batch))
+                self.sent_messages += 1
+                self.sent_embeds += len(batch)
+                return
+            except discord.HTTPException as e:
+                metrics.NOTIFY_SEND_SECONDS.observe(
+                    time.perf_counter() - start,
+                    outcome="ratelimited" if e.status == 429 else "error",
+                )
+                if e.status == 429 and attempt < MAX_SEND_ATTEMPTS:
+                    retry_after = getattr(e, "retry_after", None) or 1.0
+                    log.warning(f"[알림] 429 레이트리밋 — {retry_after:.1f}초 대기")
+                    bucket.block(retry_after)
+                    continue
+                log.error(f"[알림] 메시지 전송 실패 ({channel_id}): {e}")
+                return
+            except Exception as e:
+                log.error(f"[알림] 메시지 전송 실패 ({channel_id}): {e}")
+                return
+
+    async def drain(self, timeout=10):
+        """대기 중인 알림을 모두 전송할 때까지 대기 (종료 시 호출)."""
+        if not self._queues:
+            return
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(q.join() for q in self._queues.values())), timeout
+            )
+        except asyncio.TimeoutError:
+            log.warning(f"[알림] 종료 전 미전송 {self.depth()}건")
+        for worker in self._workers.values():
+            worker.cancel()
+
+
+# 싱글톤
+dispatcher = NotificationDispatcher()
@@ -0,0 +1,219 @@
+"""
+이벤트 기록 모듈
+신규 차량 감지 이벤트를 구조화된 레코드(기획전, 차량 ID, 시각, 주요 필드)로 보관합니다.
+
+- 메모리에는 최근 max_entries건만 유지 (오래된 것부터 일괄 제거 → 장기 실행에도 메모리 일정)
+- 시각순 목록 + 기획전별 목록을 인덱스로 유지해 since/target 질의는 이진 탐색으로 처리
+- 디스크에는 추가 전용 파일(events.jsonl)에 기록하고, 보관 한도의 2배를 넘으면
+  현재 메모리 내용으로 원자적 재작성 (재시작 시 최근 이벤트 복원)
+"""
+
+import logging
+import os
+import re
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime, timedelta
+
+from core import jsoncodec
+from core.config import EVENTS_PATH
+
+log = logging.getLogger("CasperFinder")
+
+DEFAULT_MAX_ENTRIES = 5000
+REWRITE_FACTOR = 2  # 파일 줄 수가 보관 한도의 이 배수를 넘으면 재작성
+
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)\s*([smhd])$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class Event:
+    __slots__ = (
+        "ts",
+        "exhb_no",
+        "label",
+        "vehicle_id",
+        "model",
+        "trim",
+        "ext_color",
+        "int_color",
+        "center",
+        "price",
+        "discount",
+    )
+
+    def __init__(self, ts, exhb_no, label, vehicle_id, **fields):
+        self.ts = ts
+        self.exhb_no = exhb_no
+        self.label = label
+        self.vehicle_id = vehicle_id
+        for name in self.__slots__[4:]:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_vehicle(cls, ts, exhb_no, label, vehicle):
+        return cls(
+            ts,
+            exhb_no,
+            label,
+            vehicle.vehicle_id,
+            **{name: getattr(vehicle, name) for name in cls.__slots__[4:]},
+        )
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def parse_since(text, now=None):
+    """since 인자 → epoch 초.
+
+    "30m"/"2h"/"1d"(지금부터 거슬러), "HH:MM"(오늘, 미래면 어제),
+    "YYYY-MM-DD", "YYYY-MM-DD HH:MM" 지원. 형식이 틀리면 ValueError.
+    """
+    now = time.time() if now is None else now
+    text = text.strip()
+    m = _DURATION.match(text)
+    if m:
+        return now - float(m.group(1)) * _UNITS[m.group(2)]
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            pass
+    try:
+        clock = datetime.strptime(text, "%H:%M")
+    except ValueError:
+        raise ValueError(
+            f"시각 형식 오류: {text!r} (예: 30m, 2h, 1d, 09:30, 2026-03-01 09:30)"
+        ) from None
+    today = datetime.fromtimestamp(now)
+    at = today.replace(hour=clock.hour, minute=clock.minute, second=0, microsecond=0)
+    if at.timestamp() > now:
+        at -= timedelta(days=1)
+    return at.timestamp()
+
+
+class EventStore:
+    def __init__(self, path=EVENTS_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._events = []  # 시각순
+        self._by_target = {}  # exhbNo → 시각순 목록
+        self._file = None
+        self._file_lines = 0
+
+    def configure(self, max_entries=None):
+        """보관 한도 설정. 줄어든 경우 즉시 정리."""
+        if max_entries:
+            self.max_entries = max(1, int(max_entries))
+            self._trim()
+
+    # ── 기록 ──
+    def record(self, exhb_no, label, vehicles, ts=None):
+        """신규 차량 이벤트 기록 (차량마다 1건)."""
+        ts = time.time() if ts is None else ts
+        if self._events and ts < self._events[-1].ts:
+            ts = self._events[-1].ts  # 시계가 뒤로 가도 시각순 유지
+        for vehicle in vehicles:
+            event = Event.from_vehicle(ts, exhb_no, label, vehicle)
+            self._index(event)
+            self._append(event)
+        self._trim()
+
+    def _index(self, event):
+        self._events.append(event)
+        self._by_target.setdefault(event.exhb_no, []).append(event)
+
+    def _trim(self):
+        # 한 건씩이 아니라 여유분(1/8)만큼 모였을 때 한 번에 제거
+        excess = len(self._events) - self.max_entries
+        if excess <= 0 or excess < self.max_entries // 8:
+            return
+        dropped = {}
+        for event in self._events[:excess]:
+            dropped[event.exhb_no] = dropped.get(event.exhb_no, 0) + 1
+        del self._events[:excess]
+        for exhb_no, count in dropped.items():
+            events = self._by_target[exhb_no]
+            del events[:count]
+            if not events:
+                del self._by_target[exhb_no]
+
+    # ── 조회 ──
+    def query(self, since=None, exhb_no=None, limit=20):
+        """since(epoch 초) 이후, exhbNo 기획전의 이벤트 중 최근 limit건 (오래된 순)."""
+        events = self._events if exhb_no is None else self._by_target.get(exhb_no, [])
+        start = 0
+        if since is not None:
+            start = bisect_left(events, since, key=lambda e: e.ts)
+        start = max(start, len(events) - limit)
+        return events[start:]
+
+    def count(self, since=None, exhb_no=None):
+        events = self._events if exhb_no is None else self._by_target.get(exhb_no, [])
+        if since is None:
+            return len(events)
+        return len(events) - bisect_left(events, since, key=lambda e: e.ts)
+
+    def recent(self, n=10):
+        return self._events[-n:]
+
+    def __len__(self):
+        return len(self._events)
+
+    # ── 디스크 ──
+    def load(self):
+        """파일에서 최근 max_entries건 복원. 손상된 줄(쓰기 중 크래시)은 무시."""
+        self.close()
+        self._events, self._by_target = [], {}
+        if not self.path.exists():
+            return self
+        tail = deque(maxlen=self.max_entries)
+        lines = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                lines += 1
+                try:
+                    tail.append(Event(**jsoncodec.loads(line)))
+                except Exception:
+                    log.warning("[Events] 손상된 이벤트 줄 무시")
+        for event in tail:
+            self._index(event)
+        self._file_lines = lines
+        log.info(f"[Events] 이벤트 {len(self._events)}건 복원")
+        return self
+
+    def _append(self, event):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(jsoncodec.dumps_str(event.to_dict()) + "\n")
+        self._file.flush()
+        self._file_lines += 1
+        if self._file_lines > self.max_entries * REWRITE_FACTOR:
+            self._rewrite()
+
+    def _rewrite(self):
+        """메모리에 남은 이벤트만으로 파일을 원자적으로 교체."""
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                for event in self._events:
+                    f.write(jsoncodec.dumps_str(event.to_dict()) + "\n")
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            os.replace(tmp, self.path)
+            self._file_lines = len(self._events)
+        except OSError as e:
+            log.error(f"[Events] 이벤트 파일 재작성 실패: {e}")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# 싱글톤
+events = EventStore()
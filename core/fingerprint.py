@@ -0,0 +1,83 @@
+"""
+응답 지문(fingerprint) 모듈
+페이지 응답 원본 바이트의 해시를 직전 값과 비교하여,
+변경이 없으면 JSON 파싱/필터/Diff/저장 단계를 통째로 건너뛰게 합니다.
+
+지문은 파싱과 처리가 끝난 페이지에 대해서만 확정(commit)되므로,
+가짜 응답이나 처리 도중 실패한 응답이 "변경 없음"으로 취급되지 않습니다.
+"""
+
+import hashlib
+
+# fetch_exhibition이 "직전과 동일한 응답"을 알릴 때 vehicles 자리에 넣는 표식
+UNCHANGED = object()
+
+
+def digest(body):
+    """응답 바이트 해시 (16바이트 blake2b)."""
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+class _PageState:
+    __slots__ = ("digest", "total", "ids", "pending")
+
+    def __init__(self):
+        self.digest = None
+        self.total = 0
+        self.ids = ()
+        self.pending = None
+
+
+class FingerprintCache:
+    def __init__(self):
+        self._pages = {}
+        self.hits = {}
+        self.misses = {}
+
+    def check(self, key, page_no, body):
+        """응답이 직전 확정 지문과 같으면 True (적중 카운트 증가).
+
+        다르면 새 지문을 보류(pending) 상태로 기록하고 False.
+        """
+        state = self._pages.setdefault((key, page_no), _PageState())
+        fp = digest(body)
+        if fp == state.digest:
+            self.hits[key] = self.hits.get(key, 0) + 1
+            return True
+        state.pending = fp
+        self.misses[key] = self.misses.get(key, 0) + 1
+        return False
+
+    def commit(self, key, page_no, total, ids):
+        """페이지 처리 완료 후 보류 지문 확정. ids는 해당 페이지의 대상 차량 ID."""
+        state = self._pages.get((key, page_no))
+        if state is None or state.pending is None:
+            return
+        state.digest = state.pending
+        state.pending = None
+        state.total = total
+        state.ids = tuple(ids)
+
+    def cached(self, key, page_no):
+        """확정 지문 시점의 (total, ids)."""
+        state = self._pages.get((key, page_no))
+        if state is None:
+            return 0, ()
+        return state.total, state.ids
+
+    def invalidate(self, key):
+        """key의 모든 페이지 지문 폐기."""
+        for page_key in [k for k in self._pages if k[0] == key]:
+            del self._pages[page_key]
+
+    def describe(self, *keys):
+        """상태 보고용 요약 (여러 key는 합산)."""
+        hits = sum(self.hits.get(key, 0) for key in keys)
+        total = hits + sum(self.misses.get(key, 0) for key in keys)
+        if not total:
+            return "-"
+        return f"지문 일치 {hits}/{total}회"
+
+
+# 싱글톤
+fingerprints = FingerprintCache()
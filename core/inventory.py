@@ -0,0 +1,158 @@
+"""
+실시간 매물 목록 모듈
+기획전별 최신 차량 레코드(Vehicle)를 보관하고 보조 인덱스로 조건 검색에 답합니다.
+
+- 조회 주기마다 Diff 결과로 증분 갱신: 새로 파싱한 차량만 추가/교체, 목록에서 빠진 차량만 제거
+  (지문 일치로 파싱을 건너뛴 페이지의 차량은 직전 레코드 유지)
+- 인덱스: 차종 코드/모델, 트림, 외장·내장 색상, 출고 센터(poName), 옵션, 가격·할인 구간(100만원 단위)
+- 문자열 조건은 인덱스 키(서로 다른 값 목록)에서 부분 일치를 찾고 차량 집합을 교집합하므로
+  전체 차량을 훑지 않으며 Casper API도 호출하지 않음
+"""
+
+INDEXED = ("car_code", "model", "trim", "ext_color", "int_color", "center")
+BAND = 1_000_000  # 가격/할인 구간 폭 (원)
+# 검색 조건 → 인덱스 (model은 차종 코드 AX05와 모델명 모두에서 찾음)
+TEXT_FILTERS = {
+    "model": ("car_code", "model"),
+    "trim": ("trim",),
+    "ext_color": ("ext_color",),
+    "int_color": ("int_color",),
+    "center": ("center",),
+    "option": ("options",),
+}
+
+
+def _amount(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _signature(vehicle):
+    return tuple(getattr(vehicle, name) for name in vehicle.__slots__)
+
+
+class Inventory:
+    def __init__(self):
+        self._records = {}  # exhbNo → {vehicleId: Vehicle}
+        self._index = {name: {} for name in (*INDEXED, "options", "price", "discount")}
+
+    # ── 갱신 ──
+    def update(self, exhb_no, vehicles, ids):
+        """기획전 목록 증분 갱신.
+
+        vehicles: 이번 조회에서 새로 파싱한 {vehicleId: Vehicle}
+        ids: 현재 목록 전체 vehicleId 집합 (없는 차량은 제거)
+        """
+        records = self._records.setdefault(exhb_no, {})
+        for vid in [vid for vid in records if vid not in ids]:
+            self._unindex((exhb_no, vid), records.pop(vid))
+        for vid, vehicle in vehicles.items():
+            old = records.get(vid)
+            if old is not None:
+                if _signature(old) == _signature(vehicle):
+                    continue
+                self._unindex((exhb_no, vid), old)
+            records[vid] = vehicle
+            self._reindex((exhb_no, vid), vehicle)
+
+    def forget(self, exhb_no):
+        """기획전 목록 삭제 (설정 변경으로 재초기화 시)."""
+        for vid, vehicle in self._records.pop(exhb_no, {}).items():
+            self._unindex((exhb_no, vid), vehicle)
+
+    def _entries(self, vehicle):
+        for name in INDEXED:
+            yield name, getattr(vehicle, name)
+        for option in set(vehicle.options):
+            yield "options", option
+        yield "price", _amount(vehicle.price) // BAND
+        yield "discount", _amount(vehicle.discount) // BAND
+
+    def _reindex(self, ref, vehicle):
+        for name, value in self._entries(vehicle):
+            self._index[name].setdefault(value, set()).add(ref)
+
+    def _unindex(self, ref, vehicle):
+        for name, value in self._entries(vehicle):
+            refs = self._index[name].get(value)
+            if refs is not None:
+                refs.discard(ref)
+                if not refs:
+                    del self._index[name][value]
+
+    # ── 조회 ──
+    def count(self, exhb_no=None):
+        if exhb_no is not None:
+            return len(self._records.get(exhb_no, ()))
+        return sum(len(records) for records in self._records.values())
+
+    def query(
+        self,
+        exhb_no=None,
+        min_price=None,
+        max_price=None,
+        min_discount=None,
+        **filters,
+    ):
+        """조건에 맞는 (exhbNo, Vehicle) 목록 (가격 오름차순).
+
+        filters: TEXT_FILTERS의 조건 → 대소문자 무시 부분 일치 문자열.
+        가격/할인 조건은 원 단위이며, 가격을 모르는(0) 차량은 가격 조건에서 제외.
+        """
+        candidates = []
+        if exhb_no is not None:
+            records = self._records.get(exhb_no, {})
+            candidates.append({(exhb_no, vid) for vid in records})
+        for name, needle in filters.items():
+            if needle:
+                candidates.append(self._match_text(TEXT_FILTERS[name], needle))
+        if min_price is not None or max_price is not None:
+            low = max(_amount(min_price), 1)
+            candidates.append(self._match_band("price", low, max_price))
+        if min_discount is not None:
+            candidates.append(self._match_band("discount", _amount(min_discount)))
+
+        if candidates:
+            candidates.sort(key=len)
+            refs = candidates[0].intersection(*candidates[1:])
+        else:
+            refs = [(k, vid) for k, records in self._records.items() for vid in records]
+
+        found = [(k, self._records[k][vid]) for k, vid in refs]
+        # 구간 경계의 차량은 실제 금액으로 다시 확인
+        if min_price is not None or max_price is not None:
+            low, high = max(_amount(min_price), 1), max_price
+            found = [
+                (k, v)
+                for k, v in found
+                if _amount(v.price) >= low
+                and (high is None or _amount(v.price) <= high)
+            ]
+        if min_discount is not None:
+            found = [(k, v) for k, v in found if _amount(v.discount) >= min_discount]
+        found.sort(key=lambda item: (_amount(item[1].price), item[1].vehicle_id))
+        return found
+
+    def _match_text(self, names, needle):
+        needle = str(needle).casefold()
+        refs = set()
+        for name in names:
+            for value, value_refs in self._index[name].items():
+                if needle in str(value).casefold():
+                    refs |= value_refs
+        return refs
+
+    def _match_band(self, name, low, high=None):
+        low_band = low // BAND
+        high_band = None if high is None else _amount(high) // BAND
+        refs = set()
+        for band, band_refs in self._index[name].items():
+            if band >= low_band and (high_band is None or band <= high_band):
+                refs |= band_refs
+        return refs
+
+
+# 싱글톤
+inventory = Inventory()
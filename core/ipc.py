@@ -0,0 +1,272 @@
+"""
+프로세스 간 통신 모듈 (조회 프로세스 ↔ Discord 프로세스)
+조회(fetch/파싱/Diff)와 Discord 게이트웨이를 서로 다른 프로세스로 분리할 때 사용하는 로컬 연결입니다.
+
+- Unix 도메인 소켓 1개 위의 양방향 요청/응답 (Discord 프로세스가 서버, 조회 프로세스가 클라이언트)
+- 프레임: 4바이트 길이(big endian) + JSON 본문 (core.jsoncodec)
+  요청 {"id": n, "op": "...", ...} → 응답 {"re": n, "ok": true/false, ...}
+- 조회 프로세스의 알림은 RemoteChannel.send → "send" 요청으로 전달되고, Discord 프로세스가
+  실제 전송을 마친 뒤 응답하므로 전송이 밀리면 조회 프로세스의 디스패처 큐가 쌓인다 (backpressure)
+- 연결이 끊기면 조회 프로세스는 재접속하며, 미응답 전송은 재접속 후 다시 보낸다 (누락보다 중복)
+"""
+
+import asyncio
+import base64
+import logging
+import os
+
+from core import jsoncodec
+
+log = logging.getLogger("CasperFinder")
+
+MAX_FRAME = 8 * 1024 * 1024
+REQUEST_TIMEOUT = 60  # 응답 대기 (초). Discord 레이트리밋 대기 포함
+RECONNECT_DELAY = 1.0
+# 조회 프로세스 디스패처에 쌓인 Embed가 이 수 이상이면 새 조회 일시 중지
+DEFAULT_MAX_PENDING = 200
+
+
+class LinkClosed(ConnectionError):
+    """연결이 없거나 응답 전에 끊김."""
+
+
+class RemoteError(Exception):
+    """상대 프로세스에서 요청 처리 실패."""
+
+    def is_a(self, exc_type):
+        """상대 프로세스에서 난 예외가 exc_type인지 (예외 이름 기준)."""
+        return str(self).split(":", 1)[0] == exc_type.__name__
+
+
+class RemoteMessage:
+    """Discord 프로세스가 보낸 메시지 대역 (수정/고정/고정 해제만 지원)."""
+
+    def __init__(self, link, channel_id, message_id):
+        self.link = link
+        self.channel_id = channel_id
+        self.id = message_id
+
+    async def edit(self, content=None):
+        await self.link.request(
+            "edit", channel=self.channel_id, message=self.id, content=content
+        )
+
+    async def pin(self):
+        await self.link.request("pin", channel=self.channel_id, message=self.id)
+
+    async def unpin(self):
+        await self.link.request("unpin", channel=self.channel_id, message=self.id)
+
+
+class RemoteChannel:
+    """조회 프로세스에서 쓰는 채널 대역. send()를 Discord 프로세스로 위임한다.
+
+    디스패처(core.dispatcher)와 대시보드(core.dashboard)가 bot.get_channel 결과 대신
+    그대로 사용할 수 있다.
+    """
+
+    def __init__(self, link, channel_id):
+        self.link = link
+        self.id = channel_id
+
+    def get_partial_message(self, message_id):
+        return RemoteMessage(self.link, self.id, message_id)
+
+    async def send(self, content=None, embeds=(), file=None):
+        frame = {"channel": self.id, "content": content}
+        if embeds:
+            frame["embeds"] = [embed.to_dict() for embed in embeds]
+        if file is not None:
+            frame["file"] = {
+                "name": file.filename,
+                "data": base64.b64encode(file.fp.read()).decode("ascii"),
+            }
+        while True:
+            try:
+                reply = await self.link.request("send", **frame)
+                return RemoteMessage(self.link, self.id, reply.get("id"))
+            except LinkClosed:
+                # 재접속 후 재전송 (request가 연결될 때까지 대기)
+                continue
+
+
+def attached_file(frame):
+    """send 요청의 첨부 파일 → (파일 이름, bytes). 없으면 None."""
+    file = frame.get("file")
+    if not file:
+        return None
+    return file["name"], base64.b64decode(file["data"])
+
+
+class Link:
+    """연결 1개 위의 양방향 요청/응답. handlers[op] = async fn(frame) -> dict | None."""
+
+    def __init__(self, name):
+        self.name = name
+        self.handlers = {}
+        self._writer = None
+        self._reader_task = None
+        self._server = None
+        self._pending = {}
+        self._tasks = set()
+        self._next_id = 0
+        self._connected = asyncio.Event()
+        self._closing = False
+
+    def handler(self, op):
+        """요청 처리 함수 등록 데코레이터."""
+
+        def register(fn):
+            self.handlers[op] = fn
+            return fn
+
+        return register
+
+    @property
+    def connected(self):
+        return self._writer is not None
+
+    async def wait_connected(self):
+        await self._connected.wait()
+
+    def channel(self, channel_id):
+        return RemoteChannel(self, channel_id)
+
+    # ── 요청 ──
+    async def request(self, op, timeout=REQUEST_TIMEOUT, wait=True, **fields):
+        """요청 후 응답 dict 반환. wait=False면 연결이 없을 때 즉시 LinkClosed."""
+        if not self.connected:
+            if not wait:
+                raise LinkClosed(f"{self.name}: 연결 없음")
+            await self._connected.wait()
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._write({"id": request_id, "op": op, **fields})
+            reply = await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+        if not reply.get("ok"):
+            raise RemoteError(reply.get("error"))
+        return reply
+
+    async def _write(self, frame):
+        writer = self._writer
+        if writer is None:
+            raise LinkClosed(f"{self.name}: 연결 없음")
+        data = jsoncodec.dumps(frame)
+        try:
+            writer.write(len(data).to_bytes(4, "big") + data)
+            await writer.drain()
+        except (ConnectionError, RuntimeError) as e:
+            raise LinkClosed(f"{self.name}: {e}") from e
+
+    async def _handle(self, frame):
+        op = frame.get("op")
+        handler = self.handlers.get(op)
+        try:
+            if handler is None:
+                raise LookupError(f"알 수 없는 요청: {op}")
+            reply = {"re": frame["id"], "ok": True, **(await handler(frame) or {})}
+        except Exception as e:
+            reply = {
+                "re": frame["id"],
+                "ok": False,
+                "error": f"{type(e).__name__}: {e}",
+            }
+        try:
+            await self._write(reply)
+        except LinkClosed:
+            pass
+
+    # ── 연결 관리 ──
+    def _attach(self, reader, writer):
+        if self._writer is not None:
+            log.warning(f"[IPC] {self.name}: 기존 연결을 새 연결로 교체")
+            self._detach(self._writer)
+        self._writer = writer
+        self._reader_task = asyncio.create_task(self._read_loop(reader, writer))
+        self._connected.set()
+
+    def _detach(self, writer):
+        if self._writer is not writer:
+            return
+        self._writer = None
+        self._connected.clear()
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(LinkClosed(f"{self.name}: 연결 끊김"))
+        self._pending.clear()
+        writer.close()
+
+    async def _read_loop(self, reader, writer):
+        try:
+            while True:
+                size = int.from_bytes(await reader.readexactly(4), "big")
+                if size > MAX_FRAME:
+                    raise ValueError(f"프레임 크기 초과: {size}")
+                frame = jsoncodec.loads(await reader.readexactly(size))
+                if "re" in frame:
+                    future = self._pending.get(frame["re"])
+                    if future is not None and not future.done():
+                        future.set_result(frame)
+                    continue
+                task = asyncio.create_task(self._handle(frame))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            log.error(f"[IPC] {self.name}: 수신 오류 {e!r}")
+        finally:
+            self._detach(writer)
+
+    async def serve(self, path):
+        """Unix 소켓 서버 시작 (Discord 프로세스). 새 연결은 기존 연결을 대체한다."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+        async def _on_connect(reader, writer):
+            log.info(f"[IPC] {self.name}: 조회 프로세스 연결됨")
+            self._attach(reader, writer)
+
+        self._server = await asyncio.start_unix_server(_on_connect, path=str(path))
+        log.info(f"[IPC] {self.name}: {path} 대기 중")
+
+    async def connect_forever(self, path):
+        """서버에 접속하고 끊기면 재접속 (조회 프로세스). close() 전까지 반환하지 않음."""
+        waiting_logged = False
+        while not self._closing:
+            try:
+                reader, writer = await asyncio.open_unix_connection(str(path))
+            except OSError:
+                if not waiting_logged:
+                    log.warning(f"[IPC] {self.name}: {path} 연결 대기 중...")
+                    waiting_logged = True
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+            waiting_logged = False
+            log.info(f"[IPC] {self.name}: Discord 프로세스에 연결됨")
+            self._attach(reader, writer)
+            await asyncio.shield(self._reader_task)
+            if not self._closing:
+                log.warning(f"[IPC] {self.name}: 연결 끊김 — 재접속합니다.")
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    async def close(self):
+        self._closing = True
+        if self._writer is not None:
+            self._detach(self._writer)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+# 싱글톤
+link = Link("ipc")
@@ -0,0 +1,83 @@
+"""
+JSON 코덱 모듈
+API 응답 디코딩, 디버그 캡처, 상태 저장, 설정 로드 등 모든 JSON 처리를 한 곳에서 담당합니다.
+
+설치된 백엔드 중 가장 빠른 것을 사용합니다: orjson → msgspec → 표준 json.
+- loads(data): bytes/str → 파이썬 객체
+- dumps(obj, indent=None): 객체 → UTF-8 bytes (indent 지정 시 2칸 들여쓰기)
+- dumps_str(obj, indent=None): 객체 → str
+"""
+
+import json
+import logging
+
+log = logging.getLogger("CasperFinder")
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+# ── 백엔드별 구현 ──
+def _std_loads(data):
+    return json.loads(data)
+
+
+def _std_dumps(obj, indent=None):
+    return json.dumps(obj, ensure_ascii=False, indent=indent).encode("utf-8")
+
+
+def _orjson_dumps(obj, indent=None):
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+
+def _msgspec_dumps(obj, indent=None):
+    data = msgspec.json.encode(obj)
+    return msgspec.json.format(data, indent=2) if indent else data
+
+
+BACKENDS = {"json": (_std_loads, _std_dumps)}
+if orjson is not None:
+    BACKENDS["orjson"] = (orjson.loads, _orjson_dumps)
+if msgspec is not None:
+    BACKENDS["msgspec"] = (msgspec.json.decode, _msgspec_dumps)
+
+BACKEND = None
+_loads = None
+_dumps = None
+
+
+def set_backend(name):
+    """사용할 백엔드 지정 (벤치마크/테스트용). 설치되지 않은 경우 ValueError."""
+    global BACKEND, _loads, _dumps
+    if name not in BACKENDS:
+        raise ValueError(f"JSON 백엔드를 사용할 수 없습니다: {name}")
+    BACKEND = name
+    _loads, _dumps = BACKENDS[name]
+
+
+def loads(data):
+    """JSON bytes/str 디코딩."""
+    return _loads(data)
+
+
+def dumps(obj, indent=None):
+    """JSON 인코딩 (UTF-8 bytes, 비ASCII 문자 그대로 유지)."""
+    return _dumps(obj, indent)
+
+
+def dumps_str(obj, indent=None):
+    """JSON 인코딩 (str)."""
+    return _dumps(obj, indent).decode("utf-8")
+
+
+for _name in ("orjson", "msgspec", "json"):
+    if _name in BACKENDS:
+        set_backend(_name)
+        break
@@ -0,0 +1,293 @@
+"""
+메트릭 모듈 (Prometheus/OpenMetrics 텍스트 포맷)
+조회/파싱/토큰 갱신/알림 전송 지표를 카운터·게이지·히스토그램으로 모아
+내장 HTTP 서버의 /metrics 경로로 제공합니다. (Grafana 등에서 수집)
+
+외부 라이브러리 없이 텍스트 노출 포맷(0.0.4)만 구현하며,
+HTTP 서버는 이미 의존성에 포함된 aiohttp를 사용합니다.
+"""
+
+import logging
+import math
+import time
+from contextlib import contextmanager
+
+log = logging.getLogger("CasperFinder")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9108
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20)
+PARSE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+COUNT_BUCKETS = (0, 1, 5, 10, 18, 50, 100, 200)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _fmt_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def samples(self):
+        """(접미사, 라벨 문자열, 값) 목록."""
+        return [
+            ("", _fmt_labels(self.labelnames, key), value)
+            for key, value in sorted(self._values.items())
+        ]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_fmt_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._fn = None
+
+    def set(self, value, **labels):
+        self._values[self._key(labels)] = value
+
+    def set_function(self, fn):
+        """수집 시점에 값을 계산. fn은 숫자 또는 {라벨 값 튜플: 값} dict를 반환."""
+        self._fn = fn
+
+    def samples(self):
+        if self._fn is not None:
+            try:
+                result = self._fn()
+            except Exception as e:
+                log.error(f"[Metrics] {self.name} 수집 실패: {e!r}")
+                result = {}
+            if isinstance(result, dict):
+                self._values = {
+                    tuple(str(v) for v in k): val for k, val in result.items()
+                }
+            else:
+                self._values = {(): result}
+        return super().samples()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            # [버킷별 개수..., 합계, 개수]
+            state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[i] += 1
+                break
+        state[-2] += value
+        state[-1] += 1
+
+    def snapshot(self):
+        """라벨별 버킷 개수 사본 {라벨 값 튜플: [버킷별 개수...]} (구간 분위수 계산용)."""
+        n = len(self.buckets)
+        return {key: state[:n] for key, state in self._values.items()}
+
+    def quantile(self, q, counts):
+        """버킷별 개수로 분위수 추정 (버킷 내 선형 보간). 관측이 없으면 None."""
+        total = sum(counts)
+        if not total:
+            return None
+        rank = q * total
+        cumulative = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets, counts):
+            if count and cumulative + count >= rank:
+                if bound == math.inf:
+                    return lower
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative += count
+            if bound != math.inf:
+                lower = bound
+        return lower
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        out = []
+        for key, state in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                le = f'le="{_fmt_value(bound)}"'
+                out.append(
+                    ("_bucket", _fmt_labels(self.labelnames, key, le), cumulative)
+                )
+            labels = _fmt_labels(self.labelnames, key)
+            out.append(("_sum", labels, state[-2]))
+            out.append(("_count", labels, state[-1]))
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            return self._metrics[metric.name]
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+class MetricsServer:
+    """/metrics 경로만 제공하는 내장 HTTP 서버 (aiohttp)."""
+
+    def __init__(self, registry):
+        self.registry = registry
+        self._runner = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        from aiohttp import web
+
+        async def handle(request):
+            return web.Response(
+                body=self.registry.render().encode("utf-8"),
+                headers={"Content-Type": CONTENT_TYPE},
+            )
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        try:
+            await web.TCPSite(self._runner, host, port).start()
+        except OSError as e:
+            log.error(f"[Metrics] 메트릭 서버 시작 실패 ({host}:{port}): {e}")
+            await self.stop()
+            return False
+        log.info(f"[Metrics] 메트릭 서버 시작: http://{host}:{port}/metrics")
+        return True
+
+    async def stop(self):
+        if self._runner is None:
+            return
+        await self._runner.cleanup()
+        self._runner = None
+
+
+# 싱글톤
+registry = Registry()
+server = MetricsServer(registry)
+
+# ── 조회 ──
+REQUEST_SECONDS = registry.histogram(
+    "casperfinder_request_seconds", "기획전 API 요청 지연 (초)", ("target",)
+)
+REQUESTS = registry.counter(
+    "casperfinder_requests_total",
+    "기획전 API 요청 수 (outcome: ok/unchanged/blocked/error)",
+    ("target", "outcome"),
+)
+PARSE_SECONDS = registry.histogram(
+    "casperfinder_parse_seconds",
+    "응답 JSON 디코딩 + 차량 레코드 변환 시간 (초)",
+    ("target",),
+    buckets=PARSE_BUCKETS,
+)
+VEHICLES_PER_RESPONSE = registry.histogram(
+    "casperfinder_vehicles_per_response",
+    "응답 1건당 차량 수",
+    ("target",),
+    buckets=COUNT_BUCKETS,
+)
+FINGERPRINT_CHECKS = registry.counter(
+    "casperfinder_fingerprint_checks_total",
+    "응답 지문 비교 결과 (result: hit/miss)",
+    ("target", "result"),
+)
+WAF_BLOCKS = registry.counter(
+    "casperfinder_waf_blocks_total",
+    "방화벽 차단으로 실패한 기획전 조회 수",
+    ("target",),
+)
+NEW_VEHICLES = registry.counter(
+    "casperfinder_new_vehicles_total", "감지된 신규 차량 수", ("target",)
+)
+
+# ── 토큰 갱신 ──
+REFRESH_SECONDS = registry.histogram(
+    "casperfinder_token_refresh_seconds", "토큰 갱신 소요 시간 (초)", ("outcome",)
+)
+REFRESHES = registry.counter(
+    "casperfinder_token_refresh_total",
+    "토큰 갱신 시도 수 (outcome: ok/fail)",
+    ("outcome",),
+)
+
+# ── 알림 ──
+NOTIFY_SEND_SECONDS = registry.histogram(
+    "casperfinder_notification_send_seconds",
+    "Discord 메시지 1건 전송 지연 (초)",
+    ("outcome",),
+)
+NOTIFY_EMBEDS = registry.counter(
+    "casperfinder_notification_embeds_total", "전송된 알림 Embed 수"
+)
+NOTIFY_QUEUE_DEPTH = registry.gauge(
+    "casperfinder_notification_queue_depth", "전송 대기 중인 Embed 수"
+)
@@ -1,29 +1,104 @@
 import logging
 import asyncio
 import time
-from curl_cffi import requests
+from collections import deque
+
+from curl_cffi.requests import Cookies
+
+from core import jsoncodec, metrics
+from core.config import TOKEN_STATE_PATH, load_json, save_json
+from core.session import session_pool
 
 log = logging.getLogger("CasperFinder")
 
+MAIN_URL = "https://casper.hyundai.com"
+LAYOUT_SYNC_URL = "https://casper.hyundai.com/gw/wp/common/v2/common/ui/layout-sync"
+
+DEFAULT_TOKEN_LIFETIME = 1200  # 관측값이 없을 때 사용하는 토큰 수명 (초)
+MIN_REFRESH_AFTER = 120  # 선제 갱신 최소 간격 (초)
+REFRESH_AHEAD_RATIO = 0.8  # 관측 수명의 이 비율 시점에 미리 갱신
+LIFETIME_SAMPLES = 5  # 수명 추정에 사용하는 최근 관측 수
+FAILED_RETRY_AFTER = 10  # 갱신 실패 직후 강제 갱신 재시도 최소 간격 (초)
+
+
+class TokenGeneration:
+    """한 번의 갱신으로 얻은 토큰 세트 (State-Key + 쿠키). 생성 후 변경하지 않음.
+
+    cookies는 발급 세션의 쿠키 사본(curl_cffi Cookies, 도메인 포함)이며 공유 세션 쿠키
+    저장소에는 넣지 않는다. 조회 요청은 세대 1개를 골라 그 State-Key와 쿠키를 함께
+    명시적으로 보내므로, 갱신이 요청 도중에 일어나도 새 쿠키와 이전 키가 섞이지 않는다.
+    """
+
+    __slots__ = ("number", "ux_state_key", "cookies", "issued_at", "blocked")
+
+    def __init__(self, number, ux_state_key, cookies, issued_at):
+        self.number = number
+        self.ux_state_key = ux_state_key
+        self.cookies = cookies
+        self.issued_at = issued_at
+        self.blocked = False
+
+    def age(self):
+        return time.time() - self.issued_at
+
 
 class TokenRefresher:
-    def __init__(self):
-        self.lock = asyncio.Lock()
-        self.cookies = ""
-        self.ux_state_key = ""
-        self.last_refresh_time = 0
+    def __init__(
+        self,
+        main_url=MAIN_URL,
+        layout_sync_url=LAYOUT_SYNC_URL,
+        state_path=TOKEN_STATE_PATH,
+    ):
+        self.main_url = main_url
+        self.layout_sync_url = layout_sync_url
+        self.state_path = state_path
+        self.current = None
+        self._inflight = None  # 진행 중인 갱신 Task (single-flight)
+        self._last_failure = 0.0
+        self.lifetimes = deque(maxlen=LIFETIME_SAMPLES)
         self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
 
-    async def _fetch_with_impersonate(self, url, method="GET", json_data=None):
-        """curl_cffi를 사용하여 브라우저 지문을 모방하며 요청을 보냅니다."""
+    def configure(self, main_url=None, layout_sync_url=None):
+        """토큰 발급 URL 설정 (로컬 모의 서버 등)."""
+        if main_url:
+            self.main_url = main_url
+        if layout_sync_url:
+            self.layout_sync_url = layout_sync_url
+
+    @property
+    def ux_state_key(self):
+        return self.current.ux_state_key if self.current else ""
+
+    def refresh_after(self):
+        """관측된 토큰 수명 기반 선제 갱신 시점 (발급 후 경과 초)."""
+        lifetime = min(self.lifetimes) if self.lifetimes else DEFAULT_TOKEN_LIFETIME
+        return max(MIN_REFRESH_AFTER, lifetime * REFRESH_AHEAD_RATIO)
+
+    def mark_blocked(self, generation=None):
+        """현재 세대가 WAF에 차단됨을 기록 (세대당 1회, 경과 시간을 수명 관측값으로 사용).
+
+        generation: 차단을 관측한 요청이 사용한 세대 번호. 이미 교체된 세대면 무시.
+        """
+        gen = self.current
+        if gen is None or gen.blocked:
+            return
+        if generation is not None and generation != gen.number:
+            return
+        gen.blocked = True
+        self.lifetimes.append(gen.age())
+        self._save_state()
+        log.warning(
+            f"[Refresher] 세대 #{gen.number} 차단 — 관측 수명 {gen.age():.0f}초, "
+            f"다음 선제 갱신 {self.refresh_after():.0f}초"
+        )
+
+    async def _fetch_with_impersonate(self, session, url, method="GET", json_data=None):
+        """curl_cffi 세션으로 브라우저 지문을 모방하며 요청을 보냅니다."""
         try:
-            # impersonate="chrome" 옵션이 핵심 (JA3 지문 우회)
-            resp = await asyncio.to_thread(
-                requests.request,
-                method=method,
-                url=url,
+            resp = await session.request(
+                method,
+                url,
                 json=json_data,
-                impersonate="chrome110",  # 최신 지문 사용
                 headers={
                     "User-Agent": self.user_agent,
                     "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
@@ -35,66 +110,159 @@ class TokenRefresher:
             log.error(f"[Refresher] curl_cffi 요청 중 에러: {e}")
             return None
 
-    async def refresh_tokens(self, force=False):
+    async def _build_generation(self, session):
+        """임시 세션에서 새 토큰 세트 획득 및 검증. 실패 시 None."""
+        # 1. 메인 접속하여 기본 쿠키 확보
+        resp_main = await self._fetch_with_impersonate(session, self.main_url)
+        if not resp_main:
+            log.error("[Refresher] 메인 페이지 접속 실패")
+            return None
+
+        # 2. layout-sync API 호출 (Token 출처)
+        resp_sync = await self._fetch_with_impersonate(session, self.layout_sync_url)
+        if not resp_sync or resp_sync.status_code != 200:
+            log.warning("[Refresher] ⚠️ 토큰 획득 실패 (layout-sync 응답 오류)")
+            return None
+
+        try:
+            data = jsoncodec.loads(resp_sync.content).get("data") or {}
+        except Exception as e:
+            log.error(f"[Refresher] JSON 파싱 에러: {e}")
+            return None
+
+        # 3. 검증: layoutHash 존재 + 서버가 무효(valid=false)로 표시하지 않았을 것
+        layout_hash = data.get("layoutHash")
+        if not layout_hash or str(data.get("valid", "true")).lower() == "false":
+            log.warning("[Refresher] ⚠️ 토큰 검증 실패 (layoutHash 없음/무효)")
+            return None
+
+        number = self.current.number + 1 if self.current else 1
+        # TS01 등 보안 쿠키 (메인 + layout-sync 응답 누적) 사본
+        return TokenGeneration(
+            number, layout_hash, Cookies(session.cookies), time.time()
+        )
+
+    async def refresh_tokens(self, force=False, stale_generation=None):
         """
-        curl_cffi를 사용하여 layout-sync API에서 layoutHash를 추출하고
-        보안 쿠키를 획득합니다.
+        임시 세션(독립 쿠키 저장소)에서 layout-sync API로 새 토큰 세대를 받아 검증한 뒤,
+        현재 세대(State-Key + 쿠키)를 한 번에 교체합니다.
+        갱신 중에도 조회 요청은 이전 세대를 그대로 사용합니다.
+
+        동시에 여러 곳에서 호출되면 새 갱신을 시작하지 않고 진행 중인 갱신 1건에 합류합니다.
+        stale_generation: 호출자가 차단을 관측한 세대 번호. 그 사이 새 세대로 교체됐다면 갱신 생략.
         """
-        async with self.lock:
-            now = time.time()
-            if not force and (now - self.last_refresh_time) < 1200:
-                return True
+        if self._inflight is None or self._inflight.done():
+            gen = self.current
+            if gen is not None:
+                if stale_generation is not None and gen.number > stale_generation:
+                    return True
+                if not force and gen.age() < self.refresh_after():
+                    return True
+                if force and time.time() - self._last_failure < FAILED_RETRY_AFTER:
+                    return False
+            self._inflight = asyncio.create_task(self._refresh())
+        # 합류한 호출자가 취소돼도 갱신 자체는 계속 진행
+        return await asyncio.shield(self._inflight)
 
-            log.info("[Refresher] 🚀 curl_cffi 기반 경량 토큰 갱신 시작...")
+    async def _refresh(self):
+        log.info("[Refresher] 🚀 curl_cffi 기반 경량 토큰 갱신 시작...")
+        start = time.perf_counter()
+        ok = await self._swap_generation()
+        outcome = "ok" if ok else "fail"
+        metrics.REFRESH_SECONDS.observe(time.perf_counter() - start, outcome=outcome)
+        metrics.REFRESHES.inc(outcome=outcome)
+        return ok
 
-            # 1. 메인 접속하여 기본 쿠키 확보
-            resp_main = await self._fetch_with_impersonate("https://casper.hyundai.com")
-            if not resp_main:
-                log.error("[Refresher] 메인 페이지 접속 실패")
-                return False
+    async def _swap_generation(self):
+        try:
+            async with session_pool.new_session() as staging:
+                new_gen = await self._build_generation(staging)
+                if new_gen is None:
+                    self._last_failure = time.time()
+                    return False
 
-            # 응답 쿠키 저장
-            self.cookies = "; ".join([f"{k}={v}" for k, v in resp_main.cookies.items()])
+                self.current = new_gen
+                self._save_state()
+        except Exception as e:
+            log.error(f"[Refresher] 토큰 갱신 중 예외: {e!r}")
+            self._last_failure = time.time()
+            return False
 
-            # 2. layout-sync API 호출 (Token 출처)
-            sync_url = (
-                "https://casper.hyundai.com/gw/wp/common/v2/common/ui/layout-sync"
-            )
-            resp_sync = await self._fetch_with_impersonate(sync_url)
-
-            if resp_sync and resp_sync.status_code == 200:
-                try:
-                    data = resp_sync.json()
-                    layout_hash = data.get("data", {}).get("layoutHash")
-                    if layout_hash:
-                        self.ux_state_key = layout_hash
-                        log.info(
-                            f"[Refresher] ✅ State-Key(layoutHash) 획득 성공: {layout_hash[:12]}..."
-                        )
-
-                        # 쿠키 업데이트 (TS01 등 보안 쿠키 확보 확인)
-                        new_cookies = "; ".join(
-                            [f"{k}={v}" for k, v in resp_sync.cookies.items()]
-                        )
-                        if new_cookies:
-                            self.cookies = new_cookies
-
-                        self.last_refresh_time = now
-                        return True
-                except Exception as e:
-                    log.error(f"[Refresher] JSON 파싱 에러: {e}")
+        log.info(
+            f"[Refresher] ✅ State-Key(layoutHash) 획득 성공: {new_gen.ux_state_key[:12]}... "
+            f"(세대 #{new_gen.number})"
+        )
+        return True
 
-            log.warning("[Refresher] ⚠️ 토큰 획득 실패 (layout-sync 응답 오류)")
+    # ── 재시작 간 토큰 유지 (warm start) ──
+    def _save_state(self):
+        """현재 세대(State-Key, 쿠키, User-Agent, 발급 시각)와 관측 수명을 data/ 에 저장."""
+        gen = self.current
+        if gen is None:
+            return
+        state = dict(
+            cookies=[
+                {
+                    "name": c.name,
+                    "value": c.value,
+                    "domain": c.domain,
+                    "path": c.path,
+                    "secure": bool(c.secure),
+                }
+                for c in gen.cookies.jar
+            ],
+            mainUrl=self.main_url,
+            number=gen.number,
+            uxStateKey=gen.ux_state_key,
+            userAgent=self.user_agent,
+            issuedAt=gen.issued_at,
+            blocked=gen.blocked,
+            lifetimes=list(self.lifetimes),
+        )
+        save_json(self.state_path, state, indent=None)
+
+    def restore(self):
+        """저장된 토큰이 아직 유효 기간 안이면 바로 현재 세대로 사용 (시작 시 갱신 생략).
+
+        차단 기록이 있거나, 다른 발급 주소의 토큰이거나, 선제 갱신 시점이 지났으면 False.
+        """
+        state = load_json(self.state_path, {})
+        if not state.get("uxStateKey") or state.get("mainUrl") != self.main_url:
             return False
+        self.lifetimes.extend(state.get("lifetimes") or ())
+        age = time.time() - state.get("issuedAt", 0)
+        if state.get("blocked") or not 0 <= age < self.refresh_after():
+            log.info("[Refresher] 저장된 토큰이 만료/차단 상태 — 새로 발급합니다.")
+            return False
+
+        cookies = Cookies()
+        for r in state.get("cookies") or ():
+            cookies.set(
+                r["name"],
+                r["value"],
+                domain=r.get("domain", ""),
+                path=r.get("path", "/"),
+                secure=r.get("secure", False),
+            )
+        self.user_agent = state.get("userAgent") or self.user_agent
+        self.current = TokenGeneration(
+            state.get("number", 1), state["uxStateKey"], cookies, state["issuedAt"]
+        )
+        log.info(
+            f"[Refresher] ♻️ 저장된 토큰 재사용: {self.current.ux_state_key[:12]}... "
+            f"(세대 #{self.current.number}, 발급 {age:.0f}초 전)"
+        )
+        return True
 
-    def get_headers(self):
-        """현재 유효한 보안 헤더 반환"""
-        headers = {}
-        if self.ux_state_key:
-            headers["X-UX-State-Key"] = self.ux_state_key
-        if self.cookies:
-            headers["Cookie"] = self.cookies
-        return headers
+    def credentials(self):
+        """요청 1건에 쓸 (보안 헤더, 쿠키). 같은 세대의 State-Key와 쿠키만 함께 반환.
+
+        세대가 없으면 ({}, None).
+        """
+        gen = self.current
+        if gen is None:
+            return {}, None
+        return {"X-UX-State-Key": gen.ux_state_key}, gen.cookies
 
 
 # 싱글톤
@@ -0,0 +1,137 @@
+"""
+런타임 프로파일링 모듈
+서비스를 재시작하지 않고 조회 N회 동안 cProfile + tracemalloc을 켜서
+핫 패스(요청/파싱/필터/저장/알림)의 CPU 시간과 메모리 할당 위치를 수집합니다.
+
+- SIGUSR1 또는 /profile 슬래시 명령으로 시작
+- 결과는 data/profile-<시각>.pstats (snakeviz 등으로 열람) 와 요약 텍스트(.txt)로 저장
+- 상위 N개 함수/할당 위치 요약은 상태 채널로 전송
+- cProfile/pstats/tracemalloc은 프로파일링을 시작할 때 import (시작 시간 단축)
+"""
+
+import io
+import logging
+import time
+from datetime import datetime
+
+log = logging.getLogger("CasperFinder")
+
+DEFAULT_CYCLES = 20  # 기본 수집 조회 횟수
+DEFAULT_TOP = 15  # 요약에 포함할 상위 항목 수
+TRACEMALLOC_FRAMES = 5
+
+
+def _func_label(key):
+    filename, line, func = key
+    if filename == "~":
+        return func  # 내장 함수
+    parts = filename.replace("\\", "/").split("/")
+    return f"{'/'.join(parts[-2:])}:{line}({func})"
+
+
+class CycleProfiler:
+    def __init__(self, cycles=DEFAULT_CYCLES, top=DEFAULT_TOP):
+        self.cycles = cycles
+        self.top = top
+        self._profile = None
+        self._snapshot = None
+        self._started_at = 0.0
+        self._remaining = 0
+        self._owns_tracemalloc = False
+
+    def configure(self, cycles=None, top=None):
+        if cycles:
+            self.cycles = int(cycles)
+        if top:
+            self.top = int(top)
+
+    @property
+    def active(self):
+        return self._profile is not None
+
+    def start(self, cycles=None):
+        """프로파일링 시작. 이미 진행 중이면 False."""
+        if self.active:
+            return False
+        import cProfile
+        import tracemalloc
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:  # 다른 프로파일러가 이미 활성화된 경우
+            log.error(f"[Profiler] 시작 실패: {e}")
+            return False
+        self._owns_tracemalloc = not tracemalloc.is_tracing()
+        if self._owns_tracemalloc:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self._snapshot = tracemalloc.take_snapshot()
+        self._profile = profile
+        self._remaining = int(cycles or self.cycles)
+        self._started_at = time.perf_counter()
+        log.info(f"[Profiler] 프로파일링 시작 (조회 {self._remaining}회)")
+        return True
+
+    def on_cycle(self, output_dir):
+        """조회 1회 완료 시 호출. 수집이 끝나면 결과를 저장하고 요약 텍스트 반환."""
+        if not self.active:
+            return None
+        self._remaining -= 1
+        if self._remaining > 0:
+            return None
+        return self.finish(output_dir)
+
+    def finish(self, output_dir):
+        """수집 종료 → pstats/요약 파일 저장 후 요약 텍스트 반환."""
+        profile, self._profile = self._profile, None
+        if profile is None:
+            return None
+        import pstats
+        import tracemalloc
+
+        profile.disable()
+        elapsed = time.perf_counter() - self._started_at
+
+        snapshot = tracemalloc.take_snapshot()
+        alloc_stats = snapshot.compare_to(self._snapshot, "lineno")[: self.top]
+        self._snapshot = None
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        pstats_path = output_dir / f"profile-{stamp}.pstats"
+        profile.dump_stats(str(pstats_path))
+
+        summary = self._summarize(pstats.Stats(profile), alloc_stats, elapsed)
+        # 누적 시간 기준 전체 통계는 파일에만 기록
+        buf = io.StringIO()
+        pstats.Stats(profile, stream=buf).sort_stats("cumulative").print_stats(50)
+        (output_dir / f"profile-{stamp}.txt").write_text(
+            f"{summary}\n\n{buf.getvalue()}", encoding="utf-8"
+        )
+
+        log.info(f"[Profiler] 프로파일링 완료 ({elapsed:.1f}초) → {pstats_path}")
+        return summary
+
+    def _summarize(self, stats, alloc_stats, elapsed):
+        rows = sorted(stats.stats.items(), key=lambda kv: kv[1][2], reverse=True)
+        lines = [f"수집 시간 {elapsed:.1f}초", "", "[자체 시간 상위]"]
+        for key, (_, ncalls, tottime, cumtime, _) in rows[: self.top]:
+            lines.append(
+                f"{tottime * 1000:8.1f}ms {cumtime * 1000:8.1f}ms {ncalls:>7} "
+                f"{_func_label(key)}"
+            )
+        lines += ["", "[메모리 증가 상위]"]
+        for stat in alloc_stats:
+            frame = stat.traceback[0]
+            filename = "/".join(frame.filename.replace("\\", "/").split("/")[-2:])
+            lines.append(
+                f"{stat.size_diff / 1024:+9.1f}KiB {stat.count_diff:+7} "
+                f"{filename}:{frame.lineno}"
+            )
+        return "\n".join(lines)
+
+
+# 싱글톤
+profiler = CycleProfiler()
@@ -0,0 +1,218 @@
+"""
+적응형 폴링 스케줄러 모듈
+기획전별로 다음 조회 시각을 따로 관리합니다.
+
+- 신규 차량이 자주 올라오는 시간대(시간별 감지 이력)와 최근 감지 직후에는 더 빠르게 조회
+- HTTP 에러/가짜 응답 등 실패가 이어지면 지수 백오프
+- 전체 요청 예산(분당 요청 수, 토큰 버킷)을 넘지 않도록 조회 시작을 늦춤
+- 학습한 시간대 이력은 data/scheduler_state.json 에 지연 병합 저장
+"""
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime
+
+from core.config import SCHEDULER_STATE_PATH, load_json, save_json_later
+
+log = logging.getLogger("CasperFinder")
+
+DEFAULT_BASE_INTERVAL = 3.0
+DEFAULT_MIN_INTERVAL = 1.5
+DEFAULT_MAX_INTERVAL = 120.0
+DEFAULT_JITTER = 0.99
+DEFAULT_REQUESTS_PER_MINUTE = 120
+
+HOT_WINDOW_SEC = 600  # 최근 감지 후 이 시간 동안은 최소 주기로 조회
+HISTORY_DECAY = 0.98  # 감지 1회마다 기존 시간대 이력 감쇠 비율
+ERROR_EWMA_ALPHA = 0.2
+
+
+class TargetSchedule:
+    __slots__ = (
+        "key",
+        "next_run",
+        "interval",
+        "consecutive_errors",
+        "error_rate",
+        "last_change",
+        "hourly",
+    )
+
+    def __init__(self, key, hourly=None):
+        self.key = key
+        self.next_run = 0.0
+        self.interval = DEFAULT_BASE_INTERVAL
+        self.consecutive_errors = 0
+        self.error_rate = 0.0
+        self.last_change = 0.0
+        self.hourly = list(hourly) if hourly else [0.0] * 24
+
+
+class PollScheduler:
+    def __init__(
+        self,
+        base_interval=DEFAULT_BASE_INTERVAL,
+        min_interval=DEFAULT_MIN_INTERVAL,
+        max_interval=DEFAULT_MAX_INTERVAL,
+        jitter=DEFAULT_JITTER,
+        requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+        state_path=SCHEDULER_STATE_PATH,
+    ):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.requests_per_minute = requests_per_minute
+        self.state_path = state_path
+        self.align = None  # 다중 인스턴스 interleave 슬롯 정렬 함수 (core.cluster)
+        self._targets = {}
+        self._tokens = float(requests_per_minute)
+        self._last_refill = time.monotonic()
+        self._saved_hourly = load_json(state_path, {})
+
+    def configure(self, poll_config):
+        """config.json의 "poll" 섹션 적용."""
+        poll_config = poll_config or {}
+        self.base_interval = float(poll_config.get("baseInterval", self.base_interval))
+        self.min_interval = float(poll_config.get("minInterval", self.min_interval))
+        self.max_interval = float(poll_config.get("maxInterval", self.max_interval))
+        self.jitter = float(poll_config.get("jitter", self.jitter))
+        self.requests_per_minute = int(
+            poll_config.get("requestsPerMinute", self.requests_per_minute)
+        )
+        self._tokens = min(self._tokens, float(self.requests_per_minute))
+
+    def _get(self, key):
+        sched = self._targets.get(key)
+        if sched is None:
+            sched = TargetSchedule(key, self._saved_hourly.get(key))
+            sched.interval = self.base_interval
+            self._targets[key] = sched
+        return sched
+
+    # ── 요청 예산 (토큰 버킷) ──
+    def _refill(self, now):
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(
+            float(self.requests_per_minute),
+            self._tokens + elapsed * self.requests_per_minute / 60.0,
+        )
+
+    async def acquire(self):
+        """조회 중 추가 요청(질의 매트릭스의 다른 질의, 2페이지 이후) 1건의 예산 확보.
+
+        예산이 없으면 토큰이 다시 찰 때까지 기다린 뒤 차감한다.
+        """
+        while True:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) * 60.0 / self.requests_per_minute)
+
+    # ── 스케줄링 ──
+    def due(self, keys):
+        """지금 조회해야 하는 key 목록. 예산이 부족하면 남는 대상은 다음 틱으로 미룸.
+
+        여기서는 조회 첫 요청 1건만 차감하고, 나머지 요청은 acquire()로 1건씩 확보한다.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        scheds = [self._get(k) for k in keys]
+        ready = sorted(
+            (s for s in scheds if s.next_run <= now), key=lambda s: s.next_run
+        )
+        picked = []
+        for sched in ready:
+            if self._tokens < 1:
+                break
+            self._tokens -= 1
+            # 완료 보고 전까지 중복 실행 방지
+            sched.next_run = float("inf")
+            picked.append(sched.key)
+        return picked
+
+    def record(self, key, success, new_count=0):
+        """조회 결과 반영 후 다음 조회 시각 계산."""
+        sched = self._get(key)
+        now = time.monotonic()
+
+        sched.error_rate += ERROR_EWMA_ALPHA * (
+            (0.0 if success else 1.0) - sched.error_rate
+        )
+        if success:
+            sched.consecutive_errors = 0
+        else:
+            sched.consecutive_errors += 1
+
+        if new_count:
+            sched.last_change = now
+            hour = datetime.now().hour
+            sched.hourly = [h * HISTORY_DECAY for h in sched.hourly]
+            sched.hourly[hour] += new_count
+            self._saved_hourly[key] = sched.hourly
+            save_json_later(self.state_path, self._saved_hourly)
+
+        sched.interval = self._interval_for(sched, now)
+        if self.align is not None:
+            sched.next_run = self.align(
+                now + sched.interval, sched.interval, self.jitter
+            )
+        else:
+            sched.next_run = now + sched.interval + random.uniform(0, self.jitter)
+
+    def _interval_for(self, sched, now):
+        # 실패 연속 시 지수 백오프
+        if sched.consecutive_errors:
+            backoff = self.base_interval * (2**sched.consecutive_errors)
+            return min(backoff, self.max_interval)
+
+        # 최근 감지 직후 → 최소 주기
+        if sched.last_change and now - sched.last_change < HOT_WINDOW_SEC:
+            return self.min_interval
+
+        # 시간대별 감지 이력 대비 현재 시간대 가중치 (평균 이상이면 빠르게)
+        interval = self.base_interval
+        total = sum(sched.hourly)
+        if total > 0:
+            hour = datetime.now().hour
+            window = sched.hourly[hour] + 0.5 * (
+                sched.hourly[(hour - 1) % 24] + sched.hourly[(hour + 1) % 24]
+            )
+            ratio = window / (2 * total / 24)
+            if ratio >= 1:
+                interval = self.base_interval / min(ratio, 2.0)
+
+        # 최근 오류율이 높으면 조금 여유
+        interval *= 1 + sched.error_rate
+        return max(self.min_interval, min(interval, self.max_interval))
+
+    def reset(self, key):
+        """기획전 스케줄 초기화 (설정 변경 후 재초기화 시). 다음 틱에 바로 조회된다.
+        시간대별 감지 이력은 유지하며, 조회 중이면 완료 보고 후 다시 계산된다."""
+        sched = self._targets.get(key)
+        if sched is None:
+            return
+        sched.interval = self.base_interval
+        sched.consecutive_errors = 0
+        sched.error_rate = 0.0
+        sched.last_change = 0.0
+        if sched.next_run != float("inf"):
+            sched.next_run = 0.0
+
+    def describe(self, key):
+        """상태 보고용 요약."""
+        sched = self._targets.get(key)
+        if sched is None:
+            return "-"
+        text = f"주기 {sched.interval:.1f}s"
+        if sched.consecutive_errors:
+            text += f" (백오프 {sched.consecutive_errors}회)"
+        return text
+
+
+# 싱글톤
+scheduler = PollScheduler()
@@ -0,0 +1,75 @@
+"""
+HTTP 세션 풀 모듈 (curl_cffi AsyncSession 기반)
+기획전 조회(api.py)와 토큰 갱신(playwright_refresher.py)이 함께 사용하는
+장기 유지(keep-alive) 세션을 관리합니다.
+
+- 브라우저 지문(impersonate) 위장 유지
+- HTTP/2 (서버가 ALPN으로 제공하는 경우) 사용, 아니면 HTTP/1.1
+- 보안 쿠키는 공유 쿠키 저장소에 두지 않고 요청마다 토큰 세대의 쿠키를 명시적으로 전송
+  (core.playwright_refresher.TokenGeneration)
+- curl multi 기반 네이티브 비동기 → to_thread 스레드 소모 없음
+"""
+
+import asyncio
+import logging
+
+from curl_cffi import CurlHttpVersion
+from curl_cffi.requests import AsyncSession
+
+log = logging.getLogger("CasperFinder")
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_IMPERSONATE = "chrome110"
+
+
+class SessionPool:
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, impersonate=DEFAULT_IMPERSONATE):
+        self.pool_size = pool_size
+        self.impersonate = impersonate
+        self._session = None
+        self._loop = None
+
+    def configure(self, pool_size=None, impersonate=None):
+        """풀 크기/지문 설정. 이미 열린 세션에는 다음 생성 시점부터 적용."""
+        if pool_size:
+            self.pool_size = int(pool_size)
+        if impersonate:
+            self.impersonate = impersonate
+
+    def get(self):
+        """현재 이벤트 루프에 묶인 공유 AsyncSession 반환 (없으면 생성)."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._loop is not loop:
+            self._session = AsyncSession(
+                max_clients=self.pool_size,
+                impersonate=self.impersonate,
+                http_version=CurlHttpVersion.V2TLS,
+            )
+            self._loop = loop
+            log.info(
+                f"[Session] 세션 풀 생성 (동시 연결 {self.pool_size}, 지문 {self.impersonate})"
+            )
+        return self._session
+
+    def new_session(self):
+        """공유 풀과 같은 지문을 쓰는 임시 세션 (독립 쿠키 저장소, async with 로 사용)."""
+        return AsyncSession(
+            max_clients=2,
+            impersonate=self.impersonate,
+            http_version=CurlHttpVersion.V2TLS,
+        )
+
+    async def close(self):
+        """세션 풀 종료 (봇 종료 시 호출)."""
+        if self._session is None:
+            return
+        try:
+            await self._session.close()
+        except Exception as e:
+            log.error(f"[Session] 세션 종료 실패: {e}")
+        self._session = None
+        self._loop = None
+
+
+# 싱글톤
+session_pool = SessionPool()
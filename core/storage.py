@@ -1,27 +1,167 @@
 """
 데이터 저장 모듈
-known_vehicles.json 관리.
+known_vehicles 상태 저장소 관리.
 
 원본: casperfinder_python/core/storage.py
-변경 사항: 경로만 변경 (data/ 디렉토리 사용)
+변경 사항:
+- 경로 변경 (data/ 디렉토리 사용)
+- 메모리에는 기획전별 set 유지, 변경분만 추가 전용 저널(known_vehicles.journal)에 기록
+- 저널이 일정 길이를 넘으면 스냅샷(known_vehicles.json)으로 압축(compaction)
+- 스냅샷은 save_json(원자적 저장)으로 교체하여 중간 크래시에도 손상되지 않음
 """
 
-from core.config import KNOWN_VEHICLES_PATH, load_json, save_json
+import logging
+import os
 
+from core import jsoncodec
+from core.config import (
+    KNOWN_VEHICLES_PATH,
+    KNOWN_VEHICLES_JOURNAL_PATH,
+    load_json,
+    save_json,
+)
 
-def load_known_vehicles():
-    """기존에 확인된 vehicleId 목록 로드."""
-    return load_json(KNOWN_VEHICLES_PATH, {})
+log = logging.getLogger("CasperFinder")
+
+COMPACT_EVERY = 500  # 저널 줄 수가 이 값을 넘으면 스냅샷으로 압축
+
+
+class KnownVehicleStore:
+    def __init__(
+        self,
+        snapshot_path=KNOWN_VEHICLES_PATH,
+        journal_path=KNOWN_VEHICLES_JOURNAL_PATH,
+    ):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self._data = {}
+        self._journal = None
+        self._journal_lines = 0
+
+    # ── 조회 ──
+    def __contains__(self, exhb_no):
+        return exhb_no in self._data
+
+    def get(self, exhb_no):
+        """기획전의 확인된 vehicleId 집합 (읽기 전용으로 사용)."""
+        return self._data.get(exhb_no, set())
+
+    def count(self, exhb_no):
+        return len(self._data.get(exhb_no, ()))
+
+    # ── 로드 ──
+    def load(self):
+        """스냅샷 로드 후 저널 재생. 마지막 줄이 잘린 경우(쓰기 중 크래시) 무시."""
+        self.close()
+        snapshot = load_json(self.snapshot_path, {})
+        self._data = {k: set(v) for k, v in snapshot.items()}
+
+        replayed = 0
+        if self.journal_path.exists():
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = jsoncodec.loads(line)
+                    except Exception:
+                        log.warning("[Storage] 손상된 저널 줄 무시 (중단된 쓰기)")
+                        continue
+                    self._replay(rec)
+                    replayed += 1
+
+        log.info(
+            f"[Storage] 로드 완료 — 기획전 {len(self._data)}개, 저널 {replayed}건 재생"
+        )
+        if replayed:
+            self.compact()
+        return self
+
+    def _replay(self, rec):
+        exhb_no = rec["t"]
+        if rec["op"] == "init":
+            self._data[exhb_no] = set(rec["ids"])
+        elif rec["op"] == "add":
+            self._data.setdefault(exhb_no, set()).update(rec["ids"])
+        elif rec["op"] == "del":
+            self._data.setdefault(exhb_no, set()).difference_update(rec["ids"])
+        elif rec["op"] == "drop":
+            self._data.pop(exhb_no, None)
+
+    # ── 변경 ──
+    def replace(self, exhb_no, ids):
+        """기획전의 vehicleId 집합을 ids로 교체. 저널에는 변경분만 기록."""
+        ids = set(ids)
+        if exhb_no not in self._data:
+            self._data[exhb_no] = ids
+            self._append({"op": "init", "t": exhb_no, "ids": list(ids)})
+            return
 
+        known = self._data[exhb_no]
+        added = ids - known
+        removed = known - ids
+        if added:
+            known |= added
+            self._append({"op": "add", "t": exhb_no, "ids": list(added)})
+        if removed:
+            known -= removed
+            self._append({"op": "del", "t": exhb_no, "ids": list(removed)})
 
-def save_known_vehicles(data):
-    """vehicleId 목록 저장."""
-    save_json(KNOWN_VEHICLES_PATH, data)
+    def forget(self, exhb_no):
+        """기획전 상태 삭제. 다음 조회는 초기 실행(등록만, 알림 없음)으로 처리된다."""
+        if self._data.pop(exhb_no, None) is not None:
+            self._append({"op": "drop", "t": exhb_no})
+
+    def _append(self, rec):
+        if self._journal is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal.write(jsoncodec.dumps_str(rec) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._journal_lines += 1
+        if self._journal_lines >= COMPACT_EVERY:
+            self.compact()
+
+    # ── 압축 ──
+    def compact(self):
+        """현재 상태를 스냅샷으로 원자적 저장 후 저널 비우기."""
+        snapshot = {k: list(v) for k, v in self._data.items()}
+        if not save_json(self.snapshot_path, snapshot, indent=None):
+            log.error("[Storage] 스냅샷 저장 실패 — 저널 유지")
+            return
+
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self.journal_path.exists():
+            os.remove(self.journal_path)
+        self._journal_lines = 0
+
+    def close(self):
+        """종료 시 호출. 저널을 스냅샷으로 압축."""
+        if self._journal is not None:
+            self.compact()
+
+    def reset(self):
+        """vehicleId 데이터 초기화 (스냅샷/저널 삭제)."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        self._data = {}
+        self._journal_lines = 0
+        for path in (self.snapshot_path, self.journal_path):
+            if path.exists():
+                os.remove(path)
+
+
+# 싱글톤
+known_store = KnownVehicleStore()
+
+
+def load_known_vehicles():
+    """기존에 확인된 vehicleId 상태 로드."""
+    return known_store.load()
 
 
 def reset_known_vehicles():
     """vehicleId 데이터 초기화 (파일 삭제)."""
-    if KNOWN_VEHICLES_PATH.exists():
-        import os
-
-        os.remove(KNOWN_VEHICLES_PATH)
+    known_store.reset()
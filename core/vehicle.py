@@ -0,0 +1,102 @@
+"""
+차량 레코드 모듈
+API 응답의 차량 dict를 필요한 필드만 담은 고정 슬롯 Vehicle 레코드로 변환합니다.
+
+응답 스키마(키 구성)별로 "필드 → 실제 키" 매핑을 한 번만 계산해 캐시하므로,
+차량마다 후보 키(modelNm/carName 등)를 반복 탐색하지 않습니다.
+변환 후에는 원본 dict를 보관하지 않습니다.
+"""
+
+# 필드별 후보 키 (앞쪽 우선) 와 기본값
+FIELDS = (
+    ("vehicle_id", ("vehicleId", "vin"), ""),
+    ("car_code", ("carCode",), ""),
+    ("model", ("modelNm", "carName"), "-"),
+    ("trim", ("trimNm", "trimName"), "-"),
+    ("ext_color", ("extCrNm", "exteriorColorName"), "-"),
+    ("int_color", ("intCrNm", "interiorColorName"), "-"),
+    ("center", ("poName", "deliveryCenterName"), "-"),
+    (
+        "prod_date",
+        ("carProductionDate", "carMfgDt", "mnfctDt", "productionDate"),
+        "-",
+    ),
+    ("price", ("price", "carPrice"), 0),
+    ("discount", ("discountAmt", "crDscntAmt"), 0),
+    ("options", ("optionList", "options"), ()),
+    ("yymm", ("criterionYearMonth",), ""),
+    ("prod_no", ("carProductionNumber",), ""),
+)
+OPTION_NAME_KEYS = ("optionName", "optName", "name")
+
+_schemas = {}
+_option_schemas = {}
+
+
+class Vehicle:
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+    def __init__(self, **values):
+        for name, _, default in FIELDS:
+            setattr(self, name, values.get(name, default))
+
+    def __repr__(self):
+        return f"Vehicle({self.vehicle_id!r}, {self.car_code!r}, {self.trim!r})"
+
+
+def _resolve(keys):
+    """키 구성 1개에 대한 필드별 (실제 존재하는 후보 키들, 기본값) 매핑."""
+    present = set(keys)
+    return tuple(
+        (name, tuple(k for k in candidates if k in present), default)
+        for name, candidates, default in FIELDS
+    )
+
+
+def _option_names(option_list):
+    if not isinstance(option_list, list):
+        return ()
+    names = []
+    for opt in option_list:
+        if isinstance(opt, dict):
+            keys = tuple(opt)
+            name_keys = _option_schemas.get(keys)
+            if name_keys is None:
+                name_keys = _option_schemas[keys] = tuple(
+                    k for k in OPTION_NAME_KEYS if k in opt
+                )
+            name = "-"
+            for k in name_keys:
+                val = opt[k]
+                if val is not None and val != "":
+                    name = val
+                    break
+            names.append(name)
+        elif isinstance(opt, str):
+            names.append(opt)
+    return tuple(names)
+
+
+def from_raw(raw):
+    """API 차량 dict → Vehicle. 스키마 매핑은 키 구성별로 캐시."""
+    keys = tuple(raw)
+    schema = _schemas.get(keys)
+    if schema is None:
+        schema = _schemas[keys] = _resolve(keys)
+
+    vehicle = Vehicle.__new__(Vehicle)
+    for name, present, default in schema:
+        val = default
+        for k in present:
+            v = raw[k]
+            if v is not None and v != "":
+                val = v
+                break
+        setattr(vehicle, name, val)
+    vehicle.options = _option_names(vehicle.options)
+    return vehicle
+
+
+def normalize(raw_list):
+    """응답 차량 목록 일괄 변환."""
+    return [from_raw(raw) for raw in raw_list if isinstance(raw, dict)]
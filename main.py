@@ -5,22 +5,52 @@ CasperFinder Discord Bot (casperfinder_bot)
 # [TEST] 서버 Git 자동 업데이트(pull) 트리거 테스트용 주석 추가 (2026-02-23 - 9차 최종)
 
 import asyncio
+import io
 import logging
-import random
+import signal
+import sys
+import time
 from datetime import datetime
+from pathlib import Path
 
-import aiohttp
 import discord
+from discord import app_commands
 from discord.ext import tasks
 
-from core.config import load_config, BASE_DIR
+from core.config import (
+    load_config,
+    read_config,
+    config_stamp,
+    validate_config,
+    flush_pending,
+    BASE_DIR,
+    CLUSTER_DB_PATH,
+    DATA_DIR,
+    DEBUG_DUMP_PATH,
+    IPC_SOCKET_PATH,
+)
 from core.api import (
+    build_payload,
+    expand_queries,
     fetch_exhibition,
-    extract_vehicle_id,
+    fetch_exhibition_pages,
     build_detail_url,
 )
+from core import metrics
+from core.breaker import breakers
+from core.cluster import LEASE_RENEW_EVERY, cluster
+from core.dashboard import compressed_file, dashboard, fit
+from core.debug_capture import debug_capture
+from core.dispatcher import dispatcher
+from core.events import events, parse_since
+from core.fingerprint import UNCHANGED, fingerprints
+from core.inventory import inventory
+from core.ipc import DEFAULT_MAX_PENDING, attached_file, link
 from core.playwright_refresher import refresher
-from core.storage import load_known_vehicles, save_known_vehicles
+from core.profiler import profiler
+from core.scheduler import scheduler
+from core.session import session_pool
+from core.storage import known_store, load_known_vehicles
 
 # ── 로깅 ──
 logging.basicConfig(
@@ -33,8 +63,85 @@ log = logging.getLogger("CasperFinder")
 # ── 설정 로드 ──
 config = load_config()
 DISCORD_TOKEN = config["discord"]["token"]
-INTEGRATED_CHANNEL_ID = int(config["discord"]["integratedChannelId"])
-POLL_INTERVAL = 3
+POLL_INTERVAL = 3  # 기본 조회 주기 (기획전별 실제 주기는 스케줄러가 조정)
+SCHEDULER_TICK = 0.25
+CONFIG_WATCH_INTERVAL = 2  # config.json 변경 확인 주기 (초)
+STATUS_INTERVAL = 300  # 상태 보고 기본 주기 (초, status.interval)
+MAX_CONCURRENT_FETCHES = 4  # 기획전 동시 조회 상한 (bounded fan-out)
+# 재시작해야 적용되는 설정 (변경 시 경고만)
+RESTART_ONLY_KEYS = ("discord.token", "api.poolSize", "cluster", "metrics", "ipc")
+
+
+def _optional_int(value):
+    return int(value) if value else None
+
+
+def _runtime_settings(cfg):
+    """재시작 없이 적용 가능한 설정 값 계산 (변환만 하고 상태는 바꾸지 않음).
+
+    형식이 잘못됐으면 예외. 결과는 _apply_runtime으로 한 번에 반영한다.
+    """
+    poll_config = cfg.get("poll", {})
+    debug_config = cfg.get("debug", {})
+    profile_config = cfg.get("profile", {})
+    return dict(
+        integrated_channel_id=int(cfg["discord"]["integratedChannelId"]),
+        query_concurrency=int(cfg["api"].get("queryConcurrency", 4)),
+        poll={
+            "baseInterval": float(poll_config.get("baseInterval", POLL_INTERVAL)),
+            **{
+                key: float(poll_config[key])
+                for key in ("minInterval", "maxInterval", "jitter")
+                if key in poll_config
+            },
+            **{
+                key: int(poll_config[key])
+                for key in ("requestsPerMinute",)
+                if key in poll_config
+            },
+        },
+        main_url=cfg["api"].get("mainUrl"),
+        layout_sync_url=cfg["api"].get("layoutSyncUrl"),
+        debug_entries=_optional_int(debug_config.get("maxEntries")),
+        debug_bytes=_optional_int(debug_config.get("maxBytes")),
+        profile_cycles=_optional_int(profile_config.get("cycles")),
+        profile_top=_optional_int(profile_config.get("top")),
+        event_entries=_optional_int(cfg.get("events", {}).get("maxEntries")),
+        status_interval=float(cfg.get("status", {}).get("interval") or STATUS_INTERVAL),
+    )
+
+
+def _apply_runtime(settings):
+    """_runtime_settings 결과 반영 (시작 시 및 config.json 변경 시). 변환이 끝난 값만 받는다."""
+    global INTEGRATED_CHANNEL_ID, MAX_CONCURRENT_QUERIES, STATUS_REPORT_INTERVAL
+    INTEGRATED_CHANNEL_ID = settings["integrated_channel_id"]
+    # 질의 매트릭스 동시 조회 상한 (전체 기획전 공유)
+    MAX_CONCURRENT_QUERIES = settings["query_concurrency"]
+    STATUS_REPORT_INTERVAL = settings["status_interval"]
+    scheduler.configure(settings["poll"])
+    refresher.configure(
+        main_url=settings["main_url"], layout_sync_url=settings["layout_sync_url"]
+    )
+    debug_capture.configure(
+        max_entries=settings["debug_entries"], max_bytes=settings["debug_bytes"]
+    )
+    profiler.configure(cycles=settings["profile_cycles"], top=settings["profile_top"])
+    events.configure(max_entries=settings["event_entries"])
+
+
+_apply_runtime(_runtime_settings(config))
+session_pool.configure(pool_size=config["api"].get("poolSize"))
+cluster.configure(config.get("cluster"), CLUSTER_DB_PATH)
+if cluster.interleaved:
+    scheduler.align = cluster.align
+METRICS_CONFIG = config.get("metrics", {})
+# 프로세스 분리 모드 (조회 프로세스 ↔ Discord 프로세스, core.ipc)
+IPC_CONFIG = config.get("ipc", {})
+IPC_SOCKET = Path(IPC_CONFIG.get("socket") or IPC_SOCKET_PATH)
+IPC_MAX_PENDING = int(IPC_CONFIG.get("maxPending", DEFAULT_MAX_PENDING))
+ALL, DISCORD, POLLER = "all", "discord", "poller"
+ROLE = ALL  # 실행 역할 (__main__에서 결정)
+metrics.NOTIFY_QUEUE_DEPTH.set_function(dispatcher.depth)
 STATUS_LOG_CHANNEL_ID = 1471105372755333241  # 상태 보고 채널
 GIT_LOG_CHANNEL_ID = 1471131944334000150  # 깃풀 로그 채널
 UPDATE_LOG_PATH = "/opt/casperfinder-bot/data/update.log"
@@ -52,22 +159,12 @@ def _is_target_vehicle(vehicle):
     화이트리스트 방식: _TARGET_CAR_CODES에 포함된 carCode만 허용.
     carCode가 없는 경우 → 허용 (누락 방지)
     """
-    car_code = vehicle.get("carCode", "")
+    car_code = vehicle.car_code
     if not car_code:
         return True
     return car_code in _TARGET_CAR_CODES
 
 
-# ── 차량 필드 추출 헬퍼 (원본 formatter.py에서 이식) ──
-def _get(vehicle, *keys, default="-"):
-    """차량 객체에서 여러 후보 키로 값 추출."""
-    for key in keys:
-        val = vehicle.get(key)
-        if val is not None and val != "":
-            return val
-    return default
-
-
 def _fmt_price(value):
     """가격을 원화 형식으로 포맷."""
     if isinstance(value, (int, float)) and value > 0:
@@ -75,57 +172,26 @@ def _fmt_price(value):
     return "-"
 
 
-def _get_options(vehicle):
-    """옵션 이름 목록 추출."""
-    option_list = _get(vehicle, "optionList", "options", default=[])
-    if not isinstance(option_list, list):
-        return []
-    names = []
-    for opt in option_list:
-        if isinstance(opt, dict):
-            names.append(_get(opt, "optionName", "optName", "name", default="-"))
-        elif isinstance(opt, str):
-            names.append(opt)
-    return names
-
-
 # ── Discord Embed 생성 ──
 def build_embed(vehicle, label, color_hex):
-    """차량 정보를 Discord Embed으로 변환."""
-    model = _get(vehicle, "modelNm", "carName")
-    trim = _get(vehicle, "trimNm", "trimName")
-    ext_color = _get(vehicle, "extCrNm", "exteriorColorName")
-    int_color = _get(vehicle, "intCrNm", "interiorColorName")
-    center = _get(vehicle, "poName", "deliveryCenterName")
-
-    # 생산일자 추출 및 포맷팅 (YYYYMMDD -> YYYY.MM.DD)
-    prod_date = _get(
-        vehicle,
-        "carProductionDate",
-        "carMfgDt",
-        "mnfctDt",
-        "productionDate",
-        default="-",
-    )
-    if prod_date != "-" and len(prod_date) == 8 and prod_date.isdigit():
+    """차량 정보(Vehicle 레코드)를 Discord Embed으로 변환."""
+    # 생산일자 포맷팅 (YYYYMMDD -> YYYY.MM.DD)
+    prod_date = vehicle.prod_date
+    if isinstance(prod_date, str) and len(prod_date) == 8 and prod_date.isdigit():
         prod_date = f"{prod_date[:4]}.{prod_date[4:6]}.{prod_date[6:8]}"
 
-    price = _get(vehicle, "price", "carPrice", default=0)
-    discount = _get(vehicle, "discountAmt", "crDscntAmt", default=0)
-    options = _get_options(vehicle)
-
     detail_url = build_detail_url(vehicle)
 
-    opt_text = ", ".join(options) if options else "없음"
+    opt_text = ", ".join(vehicle.options) if vehicle.options else "없음"
 
     description = (
-        f"**모델** {model} / {trim}\n"
-        f"**외장** {ext_color}\n"
-        f"**내장** {int_color}\n"
-        f"**출고** {center}\n"
+        f"**모델** {vehicle.model} / {vehicle.trim}\n"
+        f"**외장** {vehicle.ext_color}\n"
+        f"**내장** {vehicle.int_color}\n"
+        f"**출고** {vehicle.center}\n"
         f"**생산** {prod_date}\n"
-        f"**가격** {_fmt_price(price)}\n"
-        f"**할인** {_fmt_price(discount)}\n"
+        f"**가격** {_fmt_price(vehicle.price)}\n"
+        f"**할인** {_fmt_price(vehicle.discount)}\n"
         f"**옵션** {opt_text}\n\n"
         f"**[구매링크]({detail_url})**"
     )
@@ -143,199 +209,561 @@ def build_embed(vehicle, label, color_hex):
 
 
 # ── Discord Bot ──
+class CasperFinderClient(discord.Client):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.tree = app_commands.CommandTree(self)
+
+    async def setup_hook(self):
+        """슬래시 명령 동기화 및 SIGTERM(systemd 재시작) 시 정상 종료,
+        SIGUSR1 시 프로파일링 시작 등록."""
+        try:
+            loop = asyncio.get_running_loop()
+            loop.add_signal_handler(
+                signal.SIGTERM, lambda: asyncio.create_task(self.close())
+            )
+            loop.add_signal_handler(signal.SIGUSR1, profiler.start)
+        except NotImplementedError:
+            pass
+        if ROLE == DISCORD:
+            # 조회 프로세스가 접속할 IPC 서버 (메트릭은 조회 프로세스가 제공)
+            await link.serve(IPC_SOCKET)
+            if IPC_CONFIG.get("spawnPoller", True):
+                _spawn(_supervise_poller())
+        else:
+            await _start_metrics()
+            # 게이트웨이 연결(ready)을 기다리지 않고 조회 시작 (알림은 REST로 전송 가능)
+            _start_polling()
+        try:
+            await self.tree.sync()
+        except Exception as e:
+            log.error(f"[명령] 슬래시 명령 동기화 실패: {e}")
+
+    async def close(self):
+        """봇 종료 시 대기 중인 알림 전송, 공유 HTTP 세션 풀 정리 및 대기 중인 저장 기록."""
+        await _shutdown()
+        await super().close()
+
+
 intents = discord.Intents.default()
-bot = discord.Client(intents=intents)
+bot = CasperFinderClient(intents=intents)
 
-known_vehicles = {}
 poll_count = 0
-last_events = []
+_fetch_sem = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+_query_sem = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+_inflight = set()
+_token_wait_logged = False
+_backpressure_logged = False
+_poller_proc = None
+_config_stamp = config_stamp()
+_config_pending_stamp = None
+_reinit_epoch = {}  # exhbNo → 설정 변경으로 재초기화된 횟수
 last_api_status = {}
-last_api_logs = {}
 
 
-@tasks.loop(seconds=POLL_INTERVAL)
-async def poll():
-    """주기적으로 각 기획전 API를 호출하고 신규 차량을 감지."""
-    global poll_count
+def _target_overrides(target):
+    """기획전별 요청 파라미터(지역/보조금 등) 구성."""
+    exhb_no = target["exhbNo"]
+    overrides = dict(target) if target else {}
+    # carCode는 브라우저 기본값인 빈 문자열("") 유지 (봇 탐지 방어를 위해 필수)
+    overrides["carCode"] = ""
+
+    # ── 기획전 타입별 지역 설정 강제 적용 (v0.1.1 로직 이식) ──
+    # 제주 배송지 (T, T1), 서울 보조금 (1100)
+    if exhb_no.startswith("E"):
+        overrides["deliveryAreaCode"] = "T"
+        overrides["deliveryLocalAreaCode"] = "T1"
+        overrides["subsidyRegion"] = "1100"
+    elif exhb_no.startswith("D"):
+        overrides["deliveryAreaCode"] = ""
+        overrides["deliveryLocalAreaCode"] = ""
+        overrides["subsidyRegion"] = "1100"
+    elif exhb_no.startswith("R"):
+        overrides["deliveryAreaCode"] = "T"
+        overrides["deliveryLocalAreaCode"] = "T1"
+        overrides["subsidyRegion"] = ""
+    return overrides
+
+
+def _target_queries(target, api_config=None):
+    """기획전의 질의 목록 [(query_key, overrides), ...].
+
+    target.queries (없으면 api.queries) 매트릭스의 조합마다 질의 1개.
+    query_key는 지문/디버그 캡처/메트릭 구분용이며, 단일 질의면 label 그대로.
+    """
+    api_config = api_config or config["api"]
+    label = target["label"]
+    base = _target_overrides(target)
+    matrix = target.get("queries", api_config.get("queries"))
+    return [
+        (label if desc is None else f"{label}:{desc}", {**base, **overrides})
+        for desc, overrides in expand_queries(matrix)
+    ]
+
+
+async def _fetch_query_pages(session, target, key, overrides):
+    """질의 1개 조회. 페이지 응답이 도착하는 대로
+    (query_key, page_no, success, vehicles, total, error)를 yield.
+
+    페이지네이션 모드(api.paginate 또는 target.paginate, 기본 활성)가 꺼져 있으면
+    1페이지만 조회한다.
+    """
+    api_config = config["api"]
+    kwargs = dict(
+        target_overrides=overrides,
+        headers_override=api_config["headers"],
+        capture_key=key,
+    )
 
-    # 봇 토큰 획득 확인 (없으면 조회 건너뜀)
-    if not refresher.ux_state_key:
-        log.warning(
-            "[API] 보안 토큰(X-UX-State-Key)이 아직 없습니다. 조회를 대기합니다."
-        )
+    try:
+        if target.get("paginate", api_config.get("paginate", True)):
+            # 2페이지 이후 요청도 분당 요청 예산에서 1건씩 확보
+            async for page in fetch_exhibition_pages(
+                session,
+                api_config,
+                target["exhbNo"],
+                acquire=scheduler.acquire,
+                **kwargs,
+            ):
+                yield (key, *page)
+        else:
+            result = await fetch_exhibition(
+                session, api_config, target["exhbNo"], **kwargs
+            )
+            yield (key, 1, *result)
+    except Exception as e:
+        log.error(f"[{key}] API 호출 실패: {e}")
+        yield key, 0, False, [], 0, f"요청 실패: {type(e).__name__}"
+
+
+async def _fetch_target_pages(session, target):
+    """기획전 조회 단계. 모든 질의를 동시에(공유 상한 MAX_CONCURRENT_QUERIES) 조회하고
+    페이지 응답을 도착 순서대로 하나의 스트림으로 합쳐 yield."""
+    queries = _target_queries(target)
+    if len(queries) == 1:
+        async for page in _fetch_query_pages(session, target, *queries[0]):
+            yield page
         return
 
-    poll_count += 1
-
-    timeout = aiohttp.ClientTimeout(total=10)
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        for target in config["targets"]:
-            exhb_no = target["exhbNo"]
-            label = target["label"]
-            api_config = config["api"]
-            headers = api_config["headers"]
-
-            # ── 기획전 전체 차량 1회 호출 후 로컬에서 차종(AX05/AX06) 필터링 ──
-            all_vehicles = []
-            total = 0
-            last_error = None
-            any_success = False
-            all_raw_logs = []
-
-            overrides = dict(target) if target else {}
-            # carCode는 브라우저 기본값인 빈 문자열("") 유지 (봇 탐지 방어를 위해 필수)
-            overrides["carCode"] = ""
-
-            # ── 기획전 타입별 지역 설정 강제 적용 (v0.1.1 로직 이식) ──
-            # 제주 배송지 (T, T1), 서울 보조금 (1100)
-            if exhb_no.startswith("E"):
-                overrides["deliveryAreaCode"] = "T"
-                overrides["deliveryLocalAreaCode"] = "T1"
-                overrides["subsidyRegion"] = "1100"
-            elif exhb_no.startswith("D"):
-                overrides["deliveryAreaCode"] = ""
-                overrides["deliveryLocalAreaCode"] = ""
-                overrides["subsidyRegion"] = "1100"
-            elif exhb_no.startswith("R"):
-                overrides["deliveryAreaCode"] = "T"
-                overrides["deliveryLocalAreaCode"] = "T1"
-                overrides["subsidyRegion"] = ""
+    queue = asyncio.Queue()
 
-            try:
-                success, vehicles, cnt, error, raw_log = await fetch_exhibition(
-                    session,
-                    api_config,
-                    exhb_no,
-                    target_overrides=overrides,
-                    headers_override=headers,
-                )
-                all_raw_logs.append(f"--- ALL CARS ---\n{raw_log}")
-                if success:
-                    any_success = True
-                    all_vehicles.extend(vehicles)
-                    total = max(total, cnt)
-                else:
-                    last_error = error
-            except Exception as e:
-                log.error(f"[{label}] API 호출 실패: {e}")
-                all_raw_logs.append(f"--- ALL CARS ---\nERROR: {e}")
+    async def _pump(key, overrides, charged):
+        try:
+            async with _query_sem:
+                # 첫 질의는 scheduler.due()에서 차감됨, 나머지 질의는 여기서 예산 확보
+                if not charged:
+                    await scheduler.acquire()
+                async for page in _fetch_query_pages(session, target, key, overrides):
+                    await queue.put(page)
+        finally:
+            await queue.put(None)
+
+    tasks = [
+        asyncio.create_task(_pump(key, ov, i == 0))
+        for i, (key, ov) in enumerate(queries)
+    ]
+    remaining = len(tasks)
+    try:
+        while remaining:
+            page = await queue.get()
+            if page is None:
+                remaining -= 1
+                continue
+            yield page
+    finally:
+        for task in tasks:
+            task.cancel()
 
-            last_api_logs[label] = "\n".join(all_raw_logs)
 
-            last_api_logs[label] = "\n".join(all_raw_logs)
+def _notify_new(target, vehicles):
+    """신규 차량 Embed를 통합 채널과 기획전 채널 전송 큐에 추가 (전송은 디스패처가 담당)."""
+    label = target["label"]
+    color = target.get("color", "0x3B82F6")
+    embeds = [build_embed(vehicle, label, color) for vehicle in vehicles]
+    dispatcher.submit([INTEGRATED_CHANNEL_ID, int(target["channelId"])], embeds)
 
-            if not any_success:
-                log.warning(f"[{label}] 전체 실패 — {last_error}")
-                last_api_status[label] = f"FAIL: {last_error}"
 
-                # 방화벽(봇 차단) 에러로 의심되는 경우 즉시 토큰 강제 갱신
-                if "가짜 응답" in str(last_error) or "HTTP 1000" in str(last_error):
-                    log.error(
-                        "[API] 🚨 방화벽 차단 감지됨. 백그라운드 토큰 긴급 갱신을 요청합니다."
-                    )
-                    asyncio.create_task(refresher.refresh_tokens(force=True))
+async def _poll_target(session, sem, target):
+    """기획전 하나를 조회하고, 페이지 응답이 도착하는 즉시 필터/중복제거/Diff 및 알림 처리.
+    여러 질의(query matrix)의 결과는 차량 ID로 중복 제거한 뒤 한 번에 Diff 한다.
 
+    (success, 신규 차량 수, 사용한 요청 수, 마지막 오류) 반환.
+    """
+    exhb_no = target["exhbNo"]
+    label = target["label"]
+
+    epoch = _reinit_epoch.get(exhb_no, 0)
+    is_initial = exhb_no not in known_store
+    prev_ids = known_store.get(exhb_no)
+
+    current = {}
+    unchanged_ids = set()
+    unchanged_pages = 0
+    new_ids = []
+    fetched_count = 0
+    filtered_count = 0
+    total = 0
+    any_success = False
+    failed_pages = []
+    fingerprint_commits = (
+        []
+    )  # 결과를 저장할 때만 반영 (저장하지 않은 결과로 지문이 일치하지 않도록)
+    last_error = None
+    requests = 0
+
+    async with sem:
+        async for key, page_no, success, vehicles, cnt, error in _fetch_target_pages(
+            session, target
+        ):
+            requests += 1
+            if not success:
+                last_error = error
+                failed_pages.append(page_no if key == label else f"{key}#{page_no}")
+                continue
+            any_success = True
+            total = max(total, cnt)
+
+            # 지문 일치 페이지: 직전 처리 결과(ID 목록)만 재사용
+            if vehicles is UNCHANGED:
+                unchanged_pages += 1
+                _, page_ids = fingerprints.cached(key, page_no)
+                unchanged_ids.update(page_ids)
+                filtered_count += len(page_ids)
                 continue
 
-            # 중복 제거 + 화이트리스트 필터 (AX05, AX06만 추출)
-            current = {}
-            filtered_count = 0
-            for v in all_vehicles:
+            fetched_count += len(vehicles)
+
+            # 중복 제거 + 화이트리스트 필터 (AX05, AX06만 추출) + 페이지 단위 Diff
+            page_ids = []
+            page_new = []
+            for v in vehicles:
                 if _is_target_vehicle(v):
                     filtered_count += 1
-                    vid = extract_vehicle_id(v)
+                    vid = v.vehicle_id
+                    if vid:
+                        page_ids.append(vid)
                     if vid and vid not in current:
                         current[vid] = v
+                        if vid not in prev_ids:
+                            page_new.append(vid)
+
+            # 초기 실행이 아니면 페이지 도착 즉시 알림
+            # (다중 인스턴스: claim에 성공한 차량만 이 인스턴스가 알림)
+            if page_new and not is_initial:
+                log.info(f"[{label}] {page_no}페이지 신규 {len(page_new)}대 발견!")
+                new_ids.extend(page_new)
+                claimed = await cluster.claim(exhb_no, page_new)
+                if claimed:
+                    _notify_new(target, [current[vid] for vid in claimed])
+            fingerprint_commits.append((key, page_no, cnt, page_ids))
+
+    # 조회 도중 설정 변경으로 재초기화됨 → 이전 설정 기준 결과는 저장하지 않음
+    # (지문도 확정하지 않음: 폐기한 결과로 지문이 일치하면 재초기화가 건너뛰어짐)
+    if _reinit_epoch.get(exhb_no, 0) != epoch:
+        log.info(f"[{label}] 조회 중 설정 변경 — 결과 폐기 (다음 조회에서 재초기화)")
+        return any_success, len(new_ids), requests, last_error
+
+    if not any_success:
+        log.warning(f"[{label}] 전체 실패 — {last_error}")
+        last_api_status[label] = f"FAIL: {last_error}"
+        return False, 0, requests, last_error
+
+    # 초기 실행에서 일부 페이지 실패: 불완전한 목록을 등록하면 실패 페이지의 기존 차량이
+    # 다음 조회에서 전부 신규로 알림됨 → 저장하지 않고 다음 조회에서 초기화 재시도
+    if is_initial and failed_pages:
+        log.warning(f"[{label}] 초기화 보류 — 실패 페이지 {failed_pages}")
+        last_api_status[label] = f"FAIL: 초기화 중 실패 페이지 {failed_pages}"
+        return False, 0, requests, last_error
+
+    for commit in fingerprint_commits:
+        fingerprints.commit(*commit)
+
+    # 모든 페이지가 직전과 동일 → 상태/저장 단계 생략 (초기 실행은 등록해야 하므로 제외)
+    if unchanged_pages == requests and not is_initial:
+        log.info(f"[{label}] 변경 없음 (지문 일치, total: {total})")
+        return True, 0, requests, None
+
+    deduped = set(current.keys()) | unchanged_ids
+    partial = f" / 실패 페이지 {failed_pages}" if failed_pages else ""
+    last_api_status[label] = (
+        f"유효(전기차) {filtered_count}대 / 전체 {fetched_count}대 (필터적용 후 중복제거: {len(deduped)}대){partial}"
+    )
+    log.info(f"[{label}] 유효 {filtered_count}대 → 합계 {len(deduped)}대{partial}")
+
+    # 일부 페이지 실패 시 누락분이 다음 주기에 신규로 재알림되지 않도록 기존 목록 유지
+    ids = deduped | prev_ids if failed_pages else deduped
+    inventory.update(exhb_no, current, ids)
+
+    # 초기 실행: 기존 목록 등록만 하고 알림 없음
+    if is_initial:
+        known_store.replace(exhb_no, ids)
+        log.info(f"[{label}] 초기화 — {len(ids)}대 등록 (total: {total})")
+        return True, 0, requests, None
+
+    if new_ids:
+        # 저장 (변경분만 저널에 기록)
+        known_store.replace(exhb_no, ids)
+        events.record(exhb_no, label, [current[vid] for vid in new_ids])
+    else:
+        log.info(f"[{label}] 변경 없음 ({len(ids)}대, total: {total})")
+    return True, len(new_ids), requests, None
+
 
-            last_api_status[label] = (
-                f"유효(전기차) {filtered_count}대 / 전체 {len(all_vehicles)}대 (필터적용 후 중복제거: {len(current)}대)"
+def _is_waf_block(error):
+    """방화벽(봇 차단) 에러로 의심되는 실패인지 판별."""
+    return "가짜 응답" in str(error) or "HTTP 1000" in str(error)
+
+
+async def _run_target(session, target):
+    """기획전 1회 조회 후 결과를 스케줄러/서킷 브레이커에 보고 (다음 조회 시각 결정).
+
+    방화벽 차단 시 토큰 긴급 갱신을 요청하되, 여러 기획전이 동시에 차단돼도
+    갱신은 1건만 진행된다 (refresher single-flight).
+    """
+    exhb_no = target["exhbNo"]
+    breaker = breakers.get(exhb_no)
+    breaker.on_dispatch()
+    generation = refresher.current.number if refresher.current else None
+    try:
+        success, new_count, _, error = await _poll_target(session, _fetch_sem, target)
+    except Exception as e:
+        log.error(f"[{target['label']}] 처리 중 예외: {e!r}")
+        success, new_count, error = False, 0, None
+
+    blocked = not success and _is_waf_block(error)
+    breaker.record(success, blocked=blocked)
+    scheduler.record(exhb_no, success, new_count=new_count)
+    if new_count:
+        metrics.NEW_VEHICLES.inc(new_count, target=target["label"])
+
+    summary = profiler.on_cycle(DATA_DIR)
+    if summary:
+        _spawn(_post_profile_summary(summary))
+
+    if blocked:
+        metrics.WAF_BLOCKS.inc(target=target["label"])
+        log.error(
+            "[API] 🚨 방화벽 차단 감지됨. 백그라운드 토큰 긴급 갱신을 요청합니다."
+        )
+        refresher.mark_blocked(generation)
+        _spawn(refresher.refresh_tokens(force=True, stale_generation=generation))
+
+
+def _spawn(coro):
+    """백그라운드 작업 생성 (완료 전까지 참조 유지)."""
+    task = asyncio.create_task(coro)
+    _inflight.add(task)
+    task.add_done_callback(_inflight.discard)
+    return task
+
+
+def _get_channel(channel_id):
+    """채널 조회. 조회 프로세스(poller 역할)는 전송을 IPC로 Discord 프로세스에 위임.
+
+    게이트웨이 ready 전(채널 캐시 없음)에는 REST 전송용 PartialMessageable 반환.
+    """
+    if ROLE == POLLER:
+        return link.channel(channel_id)
+    return bot.get_channel(channel_id) or bot.get_partial_messageable(channel_id)
+
+
+async def _post_profile_summary(summary):
+    """프로파일링 요약을 상태 채널로 전송."""
+    log_ch = _get_channel(STATUS_LOG_CHANNEL_ID)
+    if not log_ch:
+        return
+    try:
+        await log_ch.send(f"**[프로파일링 결과]**\n```\n{summary[:1900]}\n```")
+    except Exception as e:
+        log.error(f"[로그채널] 프로파일링 결과 전송 실패: {e}")
+
+
+@tasks.loop(seconds=SCHEDULER_TICK)
+async def poll():
+    """스케줄러 틱마다 조회 시각이 된 기획전을 골라 백그라운드로 조회.
+
+    기획전별 다음 조회 시각은 core.scheduler가 감지 이력/오류율/요청 예산으로 결정하며,
+    동시 조회는 최대 MAX_CONCURRENT_FETCHES개로 제한된다.
+    서킷 브레이커가 열린(open) 기획전은 대기 시간이 끝날 때까지 제외된다.
+    프로세스 분리 모드에서는 미전송 알림이 IPC_MAX_PENDING건 이상 쌓이면 새 조회를 멈춘다.
+    """
+    global poll_count, _token_wait_logged, _backpressure_logged
+
+    # 봇 토큰 획득 확인 (없으면 조회 건너뜀)
+    if not refresher.ux_state_key:
+        if not _token_wait_logged:
+            log.warning(
+                "[API] 보안 토큰(X-UX-State-Key)이 아직 없습니다. 조회를 대기합니다."
             )
-            log.info(f"[{label}] 유효 {filtered_count}대 → 합계 {len(current)}대")
+            _token_wait_logged = True
+        return
+    _token_wait_logged = False
 
-            # 초기 실행: 기존 목록 등록만 하고 알림 없음
-            if exhb_no not in known_vehicles:
-                known_vehicles[exhb_no] = list(current.keys())
-                save_known_vehicles(known_vehicles)
-                log.info(f"[{label}] 초기화 — {len(current)}대 등록 (total: {total})")
-                continue
+    if ROLE == POLLER and dispatcher.depth() >= IPC_MAX_PENDING:
+        if not _backpressure_logged:
+            log.warning(
+                f"[IPC] 미전송 알림 {dispatcher.depth()}건 — Discord 프로세스 처리 대기로 조회 일시 중지"
+            )
+            _backpressure_logged = True
+        return
+    _backpressure_logged = False
 
-            # Diff 비교
-            prev_ids = set(known_vehicles.get(exhb_no, []))
-            new_ids = set(current.keys()) - prev_ids
-
-            if new_ids:
-                log.info(f"[{label}] 신규 {len(new_ids)}대 발견!")
-
-                color = target.get("color", "0x3B82F6")
-                integrated_ch = bot.get_channel(INTEGRATED_CHANNEL_ID)
-                target_ch = bot.get_channel(int(target["channelId"]))
-
-                for vid in new_ids:
-                    vehicle = current[vid]
-                    embed = build_embed(vehicle, label, color)
-
-                    # 통합 채널 전송
-                    if integrated_ch:
-                        try:
-                            await integrated_ch.send(content="@everyone", embed=embed)
-                        except Exception as e:
-                            log.error(f"[통합] 메시지 전송 실패: {e}")
-
-                    # 개별 기획전 채널 전송
-                    if target_ch:
-                        try:
-                            await target_ch.send(content="@everyone", embed=embed)
-                        except Exception as e:
-                            log.error(f"[{label}] 메시지 전송 실패: {e}")
-
-                # 저장
-                known_vehicles[exhb_no] = list(current.keys())
-                save_known_vehicles(known_vehicles)
-                last_events.append(
-                    f"{datetime.now().strftime('%H:%M:%S')} [{label}] 신규 {len(new_ids)}대"
-                )
-            else:
-                log.info(f"[{label}] 변경 없음 ({len(current)}대, total: {total})")
+    targets = {t["exhbNo"]: t for t in config["targets"] if cluster.owns(t["exhbNo"])}
+    due = scheduler.due(k for k in targets if breakers.get(k).ready())
+    if not due:
+        return
 
-    # 랜덤 지터 (3초 + 0~0.99초)
-    jitter = random.uniform(0, 0.99)
-    await asyncio.sleep(jitter)
+    poll_count += len(due)
+    session = session_pool.get()
+    for exhb_no in due:
+        _spawn(_run_target(session, targets[exhb_no]))
 
 
-@tasks.loop(minutes=5)
+def _status_lines(latency=None):
+    """기획전별 상태 줄 (매물 수 | API | 스케줄 | 지문 | 브레이커).
+
+    latency: {query_key: 버킷별 개수} — 주어지면 요청 지연 p50/p95 추가.
+    다중 인스턴스 split 모드에서는 이 인스턴스가 맡은 기획전만.
+    """
+    lines = []
+    for target in config["targets"]:
+        exhb_no = target["exhbNo"]
+        if not cluster.owns(exhb_no):
+            continue
+        label = target["label"]
+        keys = [key for key, _ in _target_queries(target)]
+        count = known_store.count(exhb_no)
+        api_st = last_api_status.get(label, "-")
+        sched_st = scheduler.describe(exhb_no)
+        fp_st = fingerprints.describe(*keys)
+        cb_st = breakers.describe(exhb_no)
+        line = f"**{label}** {count}대 | {api_st} | {sched_st} | {fp_st} | {cb_st}"
+        if latency is not None:
+            line += f" | {_fmt_latency(keys, latency)}"
+        lines.append(line)
+    return lines
+
+
+def _fmt_latency(keys, window):
+    """질의들의 구간 요청 지연 분위수 요약."""
+    rows = [window[key] for key in keys if key in window]
+    counts = [sum(col) for col in zip(*rows)]
+    p50 = metrics.REQUEST_SECONDS.quantile(0.5, counts)
+    if p50 is None:
+        return "지연 -"
+    p95 = metrics.REQUEST_SECONDS.quantile(0.95, counts)
+    return f"p50 {p50 * 1000:.0f}ms / p95 {p95 * 1000:.0f}ms"
+
+
+def _error_targets():
+    """API 전체 실패 또는 서킷 브레이커가 닫혀 있지 않은 기획전."""
+    return [
+        t
+        for t in config["targets"]
+        if cluster.owns(t["exhbNo"])
+        and (
+            last_api_status.get(t["label"], "").startswith("FAIL")
+            or not breakers.get(t["exhbNo"]).ready()
+        )
+    ]
+
+
+@tasks.loop(seconds=STATUS_INTERVAL)
 async def status_report():
-    """5분마다 서버 로그 채널에 상태 요약 전송."""
-    log_ch = bot.get_channel(STATUS_LOG_CHANNEL_ID)
+    """주기적 상태 보고 (status.mode).
+
+    dashboard(기본): 상태 채널의 고정 메시지 1개를 수정. API 로그는 새로 오류가 생긴
+    기획전이 있을 때만 압축 파일 1개로 첨부.
+    messages: 상태 요약과 기획전별 API 로그를 각각 새 메시지로 전송.
+    다중 인스턴스: split 모드는 인스턴스별로 맡은 기획전만, interleave 모드는 리더만 보고.
+    """
+    if cluster.interleaved and not cluster.leader:
+        return
+    log_ch = _get_channel(STATUS_LOG_CHANNEL_ID)
     if not log_ch:
         return
 
+    if config.get("status", {}).get("mode", "dashboard") == "dashboard":
+        await _update_dashboard(log_ch)
+    else:
+        await _post_status_messages(log_ch)
+
+
+def _configure_status():
+    """status.interval 적용 (시작 시 및 config.json 변경 시). 실행 중이면 다음 보고부터."""
+    if status_report.seconds != STATUS_REPORT_INTERVAL:
+        status_report.change_interval(seconds=STATUS_REPORT_INTERVAL)
+
+
+async def _update_dashboard(log_ch):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    header = f"**[상태 대시보드]** {now} 갱신"
+    if cluster.enabled:
+        header += f" ({cluster.instance_id})"
+    gen = refresher.current
+    token_st = f"세대 #{gen.number} ({gen.age() / 60:.0f}분 전 발급)" if gen else "없음"
+    lines = [
+        header,
+        f"폴링 {poll_count}회 | 알림 대기 {dispatcher.depth()}건 | 토큰 {token_st}",
+        "",
+        *_status_lines(dashboard.latency_window()),
+    ]
+    if len(events):
+        lines += ["", "**최근 이벤트**", *map(_fmt_event, events.recent(10))]
+    try:
+        await dashboard.update(log_ch, fit(lines), _get_channel)
+    except Exception as e:
+        log.error(f"[로그채널] 대시보드 갱신 실패: {e}")
+
+    # 새로 오류 상태가 된 기획전의 API 로그만 압축 파일 1개로 첨부
+    failing = _error_targets()
+    errors = dashboard.new_errors(t["label"] for t in failing)
+    if not errors or not config.get("status", {}).get("errorLogs", True):
+        return
+    captured = set(debug_capture.keys())
+    keys = [
+        key
+        for t in failing
+        if t["label"] in errors
+        for key, _ in _target_queries(t)
+        if key in captured
+    ]
+    if not keys:
+        return
+    try:
+        await log_ch.send(
+            content=f"**[오류 로그]** {', '.join(errors)}",
+            file=compressed_file(_render_debug(keys=keys)),
+        )
+    except Exception as e:
+        log.error(f"[로그채널] 오류 로그 전송 실패: {e}")
+
+
+async def _post_status_messages(log_ch):
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     # 각 기획전 현재 매물 수 + API 상태
     lines = [f"**[상태 보고]** {now}"]
-    for target in config["targets"]:
-        exhb_no = target["exhbNo"]
-        label = target["label"]
-        count = len(known_vehicles.get(exhb_no, []))
-        api_st = last_api_status.get(label, "-")
-        lines.append(f"**{label}** {count}대 | {api_st}")
+    if cluster.enabled:
+        lines[0] += f" ({cluster.instance_id})"
+    lines += _status_lines()
     lines.append(f"폴링 횟수: {poll_count}회")
 
     # 최근 이벤트
-    if last_events:
+    if len(events):
         lines.append("\n**최근 이벤트**")
-        for ev in last_events[-10:]:
-            lines.append(ev)
+        for ev in events.recent(10):
+            lines.append(_fmt_event(ev))
 
     try:
         await log_ch.send("\n".join(lines))
     except Exception as e:
         log.error(f"[로그채널] 전송 실패: {e}")
 
-    # 최신 API 로그 (기획전별 개별 코드 블록)
-    for label, raw in list(last_api_logs.items()):
+    # 최신 API 로그 (기획전별 개별 코드 블록, 보고 시점에만 렌더링)
+    for label in debug_capture.keys():
         # 메시지 길이 제한(2000자) 대응 및 가독성 개선
-        content = raw if len(raw) < 1900 else raw[:1900] + "\n...(중략)"
+        content = debug_capture.render(label, max_chars=1900)
         msg = f"**[{label} 로그]**\n```json\n{content}\n```"
         try:
             await log_ch.send(msg)
@@ -344,48 +772,573 @@ async def status_report():
             log.error(f"[로그채널] {label} 로그 전송 실패: {e}")
 
 
+@bot.tree.command(
+    name="debug", description="최근 API 요청/응답 캡처를 파일로 받습니다."
+)
+@app_commands.default_permissions(administrator=True)
+@app_commands.describe(
+    target="기획전 이름 (비우면 전체)", save="서버 data/ 폴더에도 덤프 파일 저장"
+)
+async def debug_command(
+    interaction: discord.Interaction, target: str = None, save: bool = False
+):
+    """디버그 캡처를 요청 시점에 렌더링하여 압축 첨부 파일로 응답."""
+    if ROLE == DISCORD:
+        # 캡처는 조회 프로세스에 있으므로 IPC로 요청
+        await interaction.response.defer(ephemeral=True)
+        try:
+            reply = await link.request("debug", wait=False, target=target, save=save)
+        except Exception as e:
+            await interaction.followup.send(f"조회 프로세스 응답 없음: {e}")
+            return
+        text = reply["text"]
+        send = interaction.followup.send
+    else:
+        text = _render_debug(target, save)
+        send = interaction.response.send_message
+    await send(file=compressed_file(text), ephemeral=True)
+
+
+def _fmt_event(event, with_date=False):
+    """이벤트 1건 → 한 줄 요약."""
+    stamp = datetime.fromtimestamp(event.ts)
+    stamp = stamp.strftime("%m-%d %H:%M:%S" if with_date else "%H:%M:%S")
+    return (
+        f"{stamp} [{event.label}] {event.trim} / {event.ext_color} / "
+        f"{event.center} / {_fmt_price(event.price)} (`{event.vehicle_id}`)"
+    )
+
+
+@bot.tree.command(name="events", description="신규 차량 감지 기록을 조회합니다.")
+@app_commands.default_permissions(administrator=True)
+@app_commands.describe(
+    since="이 시각 이후 (예: 30m, 2h, 1d, 09:30, 2026-03-01 09:30)",
+    target="기획전 이름 또는 번호 (비우면 전체)",
+    limit="최대 건수 (기본 20)",
+)
+async def events_command(
+    interaction: discord.Interaction,
+    since: str = None,
+    target: str = None,
+    limit: app_commands.Range[int, 1, 200] = 20,
+):
+    """이벤트 기록을 인덱스로 조회 (Casper API 호출 없음)."""
+    if ROLE == DISCORD:
+        # 이벤트 기록은 조회 프로세스에 있으므로 IPC로 요청
+        try:
+            reply = await link.request(
+                "events", wait=False, since=since, target=target, limit=limit
+            )
+            text = reply["text"]
+        except Exception as e:
+            text = f"조회 프로세스 응답 없음: {e}"
+    else:
+        text = _render_events(since, target, limit)
+    await interaction.response.send_message(text, ephemeral=True)
+
+
+def _render_events(since=None, target=None, limit=20):
+    try:
+        since_ts = parse_since(since) if since else None
+    except ValueError as e:
+        return str(e)
+    exhb_no = None
+    if target:
+        match = _find_target(target)
+        if match is None:
+            return f"알 수 없는 기획전: {target}"
+        exhb_no = match["exhbNo"]
+
+    found = events.query(since=since_ts, exhb_no=exhb_no, limit=limit)
+    total = events.count(since=since_ts, exhb_no=exhb_no)
+    if not found:
+        return "해당 조건의 감지 기록이 없습니다."
+    header = f"**[감지 기록]** {total}건"
+    if total > len(found):
+        header += f" 중 최근 {len(found)}건"
+    # 최신순 (길이 제한 시 오래된 기록부터 생략)
+    return fit([header, *(_fmt_event(e, with_date=True) for e in reversed(found))])
+
+
+def _find_target(name):
+    """기획전 이름 또는 번호로 설정의 기획전 찾기."""
+    return next(
+        (t for t in config["targets"] if name in (t["label"], t["exhbNo"])), None
+    )
+
+
+@bot.tree.command(
+    name="inventory", description="현재 올라와 있는 매물을 조건으로 검색합니다."
+)
+@app_commands.default_permissions(administrator=True)
+@app_commands.describe(
+    target="기획전 이름 또는 번호 (비우면 전체)",
+    model="차종 코드 또는 모델명 (예: AX05)",
+    trim="트림 (예: 인스퍼레이션)",
+    ext_color="외장 색상 (부분 일치)",
+    int_color="내장 색상 (부분 일치)",
+    center="출고 센터 (부분 일치)",
+    option="옵션 (부분 일치)",
+    max_price="최대 가격 (만원)",
+    min_price="최소 가격 (만원)",
+    min_discount="최소 할인 (만원)",
+    limit="최대 건수 (기본 20)",
+)
+async def inventory_command(
+    interaction: discord.Interaction,
+    target: str = None,
+    model: str = None,
+    trim: str = None,
+    ext_color: str = None,
+    int_color: str = None,
+    center: str = None,
+    option: str = None,
+    max_price: int = None,
+    min_price: int = None,
+    min_discount: int = None,
+    limit: app_commands.Range[int, 1, 100] = 20,
+):
+    """매물 목록을 보조 인덱스로 검색 (Casper API 호출 없음)."""
+    query = dict(
+        target=target,
+        model=model,
+        trim=trim,
+        ext_color=ext_color,
+        int_color=int_color,
+        center=center,
+        option=option,
+        max_price=max_price,
+        min_price=min_price,
+        min_discount=min_discount,
+        limit=limit,
+    )
+    if ROLE == DISCORD:
+        # 매물 목록은 조회 프로세스에 있으므로 IPC로 요청
+        try:
+            text = (await link.request("inventory", wait=False, **query))["text"]
+        except Exception as e:
+            text = f"조회 프로세스 응답 없음: {e}"
+    else:
+        text = _render_inventory(**query)
+    await interaction.response.send_message(text, ephemeral=True)
+
+
+def _render_inventory(
+    target=None, max_price=None, min_price=None, min_discount=None, limit=20, **filters
+):
+    started = time.perf_counter()
+    exhb_no = None
+    if target:
+        match = _find_target(target)
+        if match is None:
+            return f"알 수 없는 기획전: {target}"
+        exhb_no = match["exhbNo"]
+
+    def won(manwon):
+        return None if manwon is None else manwon * 10000
+
+    found = inventory.query(
+        exhb_no=exhb_no,
+        min_price=won(min_price),
+        max_price=won(max_price),
+        min_discount=won(min_discount),
+        **filters,
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    if not found:
+        return f"조건에 맞는 매물이 없습니다. (전체 {inventory.count(exhb_no)}대)"
+    labels = {t["exhbNo"]: t["label"] for t in config["targets"]}
+    header = f"**[매물 검색]** {len(found)}대"
+    if len(found) > limit:
+        header += f" 중 가격순 {limit}대"
+    lines = [f"{header} ({elapsed:.1f}ms)"]
+    for k, v in found[:limit]:
+        line = (
+            f"[{labels.get(k, k)}] {v.model} {v.trim} / {v.ext_color} / {v.int_color}"
+            f" / {v.center} / {_fmt_price(v.price)}"
+        )
+        if isinstance(v.discount, (int, float)) and v.discount > 0:
+            line += f" (할인 {_fmt_price(v.discount)})"
+        lines.append(f"{line} (`{v.vehicle_id}`)")
+    return fit(lines)
+
+
+def _render_debug(target=None, save=False, keys=None):
+    if keys is None:
+        keys = [target] if target else debug_capture.keys()
+    text = "\n\n".join(f"===== {k} =====\n{debug_capture.render(k)}" for k in keys)
+    if save:
+        debug_capture.dump(DEBUG_DUMP_PATH)
+    return text
+
+
+@bot.tree.command(
+    name="profile", description="조회 N회 동안 CPU/메모리 프로파일을 수집합니다."
+)
+@app_commands.default_permissions(administrator=True)
+@app_commands.describe(cycles="수집할 조회 횟수 (비우면 설정값)")
+async def profile_command(interaction: discord.Interaction, cycles: int = None):
+    """프로파일링 시작. 결과는 data/ 에 저장되고 요약은 상태 채널로 전송."""
+    if ROLE == DISCORD:
+        try:
+            reply = await link.request("profile", wait=False, cycles=cycles)
+            started, cycles = reply["started"], reply["cycles"]
+        except Exception as e:
+            await interaction.response.send_message(
+                f"조회 프로세스 응답 없음: {e}", ephemeral=True
+            )
+            return
+    else:
+        started, cycles = profiler.start(cycles), cycles or profiler.cycles
+    if started:
+        msg = f"프로파일링 시작 — 조회 {cycles}회 후 상태 채널에 요약을 보고합니다."
+    else:
+        msg = "프로파일링을 시작할 수 없습니다 (이미 진행 중)."
+    await interaction.response.send_message(msg, ephemeral=True)
+
+
+@link.handler("send")
+async def _ipc_send(frame):
+    """[Discord 프로세스] 조회 프로세스가 보낸 메시지 전송."""
+    channel = _get_channel(frame["channel"])
+    kwargs = {"content": frame.get("content")}
+    if frame.get("embeds"):
+        kwargs["embeds"] = [discord.Embed.from_dict(e) for e in frame["embeds"]]
+    file = attached_file(frame)
+    if file:
+        kwargs["file"] = discord.File(io.BytesIO(file[1]), filename=file[0])
+    message = await channel.send(**kwargs)
+    return {"id": message.id}
+
+
+@link.handler("edit")
+async def _ipc_edit(frame):
+    """[Discord 프로세스] 메시지 수정 (상태 대시보드)."""
+    message = _get_channel(frame["channel"]).get_partial_message(frame["message"])
+    await message.edit(content=frame.get("content"))
+
+
+@link.handler("pin")
+async def _ipc_pin(frame):
+    """[Discord 프로세스] 메시지 고정 (상태 대시보드)."""
+    await _get_channel(frame["channel"]).get_partial_message(frame["message"]).pin()
+
+
+@link.handler("unpin")
+async def _ipc_unpin(frame):
+    """[Discord 프로세스] 메시지 고정 해제 (교체된 상태 대시보드)."""
+    message = _get_channel(frame["channel"]).get_partial_message(frame["message"])
+    await message.unpin()
+
+
+@link.handler("debug")
+async def _ipc_debug(frame):
+    """[조회 프로세스] /debug 명령 처리."""
+    return {"text": _render_debug(frame.get("target"), frame.get("save", False))}
+
+
+@link.handler("events")
+async def _ipc_events(frame):
+    """[조회 프로세스] /events 명령 처리."""
+    return {
+        "text": _render_events(
+            frame.get("since"), frame.get("target"), frame.get("limit", 20)
+        )
+    }
+
+
+@link.handler("inventory")
+async def _ipc_inventory(frame):
+    """[조회 프로세스] /inventory 명령 처리."""
+    query = {k: v for k, v in frame.items() if k not in ("id", "op")}
+    return {"text": _render_inventory(**query)}
+
+
+@link.handler("profile")
+async def _ipc_profile(frame):
+    """[조회 프로세스] /profile 명령 처리."""
+    cycles = frame.get("cycles")
+    return {"started": profiler.start(cycles), "cycles": cycles or profiler.cycles}
+
+
 @status_report.before_loop
 async def before_status_report():
-    await bot.wait_until_ready()
+    """Discord 준비 대기. 조회 프로세스는 게이트웨이가 없으므로 바로 시작
+    (메시지는 IPC 연결 전까지 대기)."""
+    if ROLE != POLLER:
+        await bot.wait_until_ready()
 
 
 @poll.before_loop
 async def before_poll():
-    """봇이 ready 상태가 될 때까지 대기하고 최초 토큰 획득."""
-    await bot.wait_until_ready()
-    # 첫 조회 전 토큰 획득
+    """최초 토큰 획득 (저장된 토큰을 재사용했으면 생략)."""
+    if refresher.current:
+        return
     log.info("[casperfinder_bot] 최초 API 보안 토큰(WAF 우회용) 획득을 시도합니다...")
     await refresher.refresh_tokens(force=True)
 
 
-@tasks.loop(minutes=20)
+@tasks.loop(seconds=30)
 async def refresh_tokens_loop():
-    """20분마다 주기적으로 안전하게 보안 토큰(WAF/쿠키)을 갱신합니다."""
+    """관측된 토큰 수명에 맞춰 만료 전에 보안 토큰(WAF/쿠키)을 미리 갱신합니다.
+
+    갱신은 새 세대를 받아 검증한 뒤 교체하므로 조회는 갱신 중에도 멈추지 않습니다.
+    """
     await refresher.refresh_tokens(force=False)
 
 
-@refresh_tokens_loop.before_loop
-async def before_refresh():
-    await bot.wait_until_ready()
+@tasks.loop(seconds=LEASE_RENEW_EVERY)
+async def cluster_heartbeat():
+    """다중 인스턴스 리더 임대 갱신."""
+    await cluster.renew_lease()
 
 
-@bot.event
-async def on_ready():
-    global known_vehicles
-    known_vehicles = load_known_vehicles()
-    log.info(f"[casperfinder_bot] 로그인 완료: {bot.user}")
+def _target_signature(target, api_config):
+    """조회 결과에 영향을 주는 기획전 파라미터 (바뀌면 재초기화 대상)."""
+    return {
+        "payloads": [
+            build_payload(api_config, target["exhbNo"], overrides)
+            for _, overrides in _target_queries(target, api_config)
+        ],
+        "baseUrl": api_config.get("baseUrl"),
+        "headers": api_config.get("headers"),
+        "paginate": target.get("paginate", api_config.get("paginate", True)),
+    }
+
+
+def _config_value(cfg, dotted):
+    for part in dotted.split("."):
+        cfg = cfg.get(part) if isinstance(cfg, dict) else None
+    return cfg
+
+
+def _reinitialize(exhb_no, query_keys=()):
+    """기획전 상태 초기화. 다음 조회는 초기 실행(등록만, 알림 없음)으로 처리된다."""
+    _reinit_epoch[exhb_no] = _reinit_epoch.get(exhb_no, 0) + 1
+    known_store.forget(exhb_no)
+    inventory.forget(exhb_no)
+    for key in query_keys:
+        fingerprints.invalidate(key)
+    scheduler.reset(exhb_no)
+    breakers.reset(exhb_no)
+
+
+def _reload_config(new):
+    """변경된 설정 적용. 검증에 실패하면 기존 설정을 유지하고 문제 목록 반환.
+
+    새 설정의 값은 모두 먼저 계산·검증하고, 그 뒤에 예외가 나지 않는 단계로만
+    재초기화/교체/반영한다. 교체는 await 없이 한 번에 이뤄지므로 조회 루프는
+    이전/새 설정 중 하나만 본다.
+    조회 파라미터가 바뀌었거나 새로 추가된 기획전만 재초기화하고,
+    나머지 기획전의 차량 목록/지문/스케줄은 그대로 유지한다.
+    """
+    global config, _query_sem
+    errors = validate_config(new)
+    if errors:
+        return errors
+    try:
+        new_signatures = {
+            t["exhbNo"]: _target_signature(t, new["api"]) for t in new["targets"]
+        }
+        new_queries = {
+            t["exhbNo"]: [key for key, _ in _target_queries(t, new["api"])]
+            for t in new["targets"]
+        }
+        settings = _runtime_settings(new)
+    except Exception as e:
+        return [f"설정 구성 실패: {e!r}"]
+
+    old = config
+    old_targets = {t["exhbNo"]: t for t in old["targets"]}
+    changed, added = [], []
+    for exhb_no, signature in new_signatures.items():
+        prev = old_targets.get(exhb_no)
+        if prev is None:
+            added.append(exhb_no)
+        elif _target_signature(prev, old["api"]) != signature:
+            changed.append(exhb_no)
+    removed = [k for k in old_targets if k not in new_signatures]
+    # 재초기화할 질의 키 (바뀐/제거된 기획전은 이전 설정 기준,
+    # 추가된 기획전은 예전에 감시하던 오래된 목록/지문으로 Diff 하지 않도록 새 설정 기준)
+    reinit = {
+        exhb_no: [key for key, _ in _target_queries(old_targets[exhb_no], old["api"])]
+        for exhb_no in changed + removed
+    }
+    reinit.update((exhb_no, new_queries[exhb_no]) for exhb_no in added)
+
+    # ── 여기부터는 예외 없이 반영 ──
+    for exhb_no, keys in reinit.items():
+        _reinitialize(exhb_no, keys)
+    config = new
+    prev_queries = MAX_CONCURRENT_QUERIES
+    _apply_runtime(settings)
+    _configure_status()
+    if MAX_CONCURRENT_QUERIES != prev_queries:
+        _query_sem = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+
+    labels = {t["exhbNo"]: t["label"] for t in [*old["targets"], *new["targets"]]}
+    log.info(
+        "[Config] 설정 변경 적용 — "
+        f"추가 {[labels[k] for k in added]}, 재초기화 {[labels[k] for k in changed]}, "
+        f"제거 {[labels[k] for k in removed]}"
+    )
+    for key in RESTART_ONLY_KEYS:
+        if _config_value(old, key) != _config_value(new, key):
+            log.warning(f"[Config] {key} 변경은 재시작 후 적용됩니다.")
+    return []
+
+
+@tasks.loop(seconds=CONFIG_WATCH_INTERVAL)
+async def config_watch():
+    """config.json 수정 시각을 확인해 바뀌면 재시작 없이 다시 적용.
+
+    저장 도중의 파일을 읽지 않도록 두 번 연속 같은 상태일 때 적용한다.
+    """
+    global _config_stamp, _config_pending_stamp
+    stamp = config_stamp()
+    if stamp is None or stamp == _config_stamp:
+        _config_pending_stamp = None
+        return
+    if stamp != _config_pending_stamp:
+        _config_pending_stamp = stamp
+        return
+    _config_stamp = stamp
+    _config_pending_stamp = None
+
+    try:
+        errors = _reload_config(read_config())
+    except Exception as e:
+        errors = [f"읽기 실패: {e!r}"]
+    if errors:
+        log.error(f"[Config] 설정 변경 무시 (기존 설정 유지): {'; '.join(errors)}")
+        log_ch = _get_channel(STATUS_LOG_CHANNEL_ID)
+        if log_ch:
+            try:
+                await log_ch.send(
+                    "**[설정 오류]** config.json 변경을 적용하지 않았습니다.\n"
+                    + "\n".join(f"- {e}" for e in errors[:10])
+                )
+            except Exception as e:
+                log.error(f"[로그채널] 설정 오류 전송 실패: {e}")
+
+
+def _start_polling():
+    """저장 상태 로드 후 조회/토큰 갱신/상태 보고 루프 시작.
+
+    저장된 토큰이 아직 유효하면 바로 재사용하므로 첫 조회가 토큰 발급을 기다리지 않는다.
+    """
+    load_known_vehicles()
+    events.load()
+    refresher.restore()
+    dispatcher.start(_get_channel)
     log.info(
         f"[casperfinder_bot] 감시 대상: {', '.join(t['label'] for t in config['targets'])}"
     )
-    log.info(f"[casperfinder_bot] 폴링 간격: ~{POLL_INTERVAL}초 + 랜덤 지터")
+    log.info(
+        f"[casperfinder_bot] 폴링 간격: 기본 ~{scheduler.base_interval}초 (기획전별 적응형)"
+    )
 
     poll.start()
     refresh_tokens_loop.start()
+    _configure_status()
     status_report.start()
+    config_watch.start()
+    if cluster.enabled:
+        cluster_heartbeat.start()
+
+
+async def _start_metrics():
+    if METRICS_CONFIG.get("enabled"):
+        await metrics.server.start(
+            METRICS_CONFIG.get("host", metrics.DEFAULT_HOST),
+            int(METRICS_CONFIG.get("port", metrics.DEFAULT_PORT)),
+        )
+
+
+async def _shutdown():
+    """대기 중인 알림 전송, 공유 HTTP 세션 풀 정리 및 대기 중인 저장 기록."""
+    await dispatcher.drain()
+    await session_pool.close()
+    await metrics.server.stop()
+    await cluster.close()
+    await _stop_poller()
+    await link.close()
+    known_store.close()
+    events.close()
+    flush_pending()
+
+
+async def _supervise_poller():
+    """[Discord 프로세스] 조회 프로세스 실행 및 비정상 종료 시 재시작."""
+    global _poller_proc
+    while True:
+        _poller_proc = await asyncio.create_subprocess_exec(
+            sys.executable, str(BASE_DIR / "main.py"), POLLER
+        )
+        log.info(f"[IPC] 조회 프로세스 시작 (PID {_poller_proc.pid})")
+        code = await _poller_proc.wait()
+        if _poller_proc is None:
+            return
+        log.error(f"[IPC] 조회 프로세스 종료 (코드 {code}) — 5초 후 재시작")
+        await asyncio.sleep(5)
+
+
+async def _stop_poller():
+    global _poller_proc
+    proc, _poller_proc = _poller_proc, None
+    if proc is None or proc.returncode is not None:
+        return
+    proc.terminate()
+    try:
+        await asyncio.wait_for(proc.wait(), 15)
+    except asyncio.TimeoutError:
+        proc.kill()
+
+
+async def run_poller():
+    """조회 프로세스 실행 (Discord 게이트웨이 없이 알림을 IPC로 Discord 프로세스에 전달)."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, stop.set)
+    loop.add_signal_handler(signal.SIGINT, stop.set)
+    loop.add_signal_handler(signal.SIGUSR1, profiler.start)
+    await _start_metrics()
+    connector = asyncio.create_task(link.connect_forever(IPC_SOCKET))
+    _start_polling()
+    await stop.wait()
+
+    log.info("[casperfinder_bot] 조회 프로세스 종료 중...")
+    for loop_task in (
+        poll,
+        refresh_tokens_loop,
+        status_report,
+        config_watch,
+        cluster_heartbeat,
+    ):
+        loop_task.cancel()
+    await _shutdown()
+    connector.cancel()
+
+
+@bot.event
+async def on_ready():
+    log.info(f"[casperfinder_bot] 로그인 완료: {bot.user}")
 
 
 if __name__ == "__main__":
-    bot.run(DISCORD_TOKEN)
+    # python main.py          : 단일 프로세스 (ipc.enabled 이면 Discord 프로세스 + 조회 프로세스 실행)
+    # python main.py poller   : 조회 프로세스만 실행 (Discord 프로세스에 IPC로 연결)
+    # python main.py discord  : Discord 프로세스만 실행 (ipc.spawnPoller=false 와 함께 사용)
+    if len(sys.argv) > 1:
+        ROLE = sys.argv[1]
+        if ROLE not in (ALL, DISCORD, POLLER):
+            sys.exit(f"사용법: python main.py [{ALL}|{DISCORD}|{POLLER}]")
+    elif IPC_CONFIG.get("enabled"):
+        ROLE = DISCORD
+    if ROLE == POLLER:
+        asyncio.run(run_poller())
+    else:
+        bot.run(DISCORD_TOKEN)
 # Auto-update test
 # Another test at 22:31
 # Final robust test 22:36